@@ -1,112 +1,70 @@
-import random
+# S-AES的CBC/CTR工作模式与密文篡改实验，算法实现见 saes.narrow 和 saes.modes
+import io
 
-# 定义S-AES算法的必要常量和辅助函数
-S_BOX = [0x9, 0x4, 0xA, 0xB, 0xD, 0x1, 0x8, 0x5, 0x6, 0x2, 0x0, 0x3, 0xC, 0xE, 0xF, 0x7]
-INV_S_BOX = [0xA, 0x5, 0x9, 0xB, 0x1, 0x7, 0x8, 0xF, 0x6, 0x0, 0x2, 0x3, 0xC, 0x4, 0xD, 0xE]
-RCON1, RCON2 = 0x80, 0x30
-
-# S-AES辅助函数
-def sub_nibbles(state):
-    return [S_BOX[nibble] for nibble in state]
-
-def inv_sub_nibbles(state):
-    return [INV_S_BOX[nibble] for nibble in state]
-
-# 修改shift_rows和inv_shift_rows函数，使其适用于16位分组
-def shift_rows(state):
-    # 对于S-AES的16位分组，不需要实际的行移位
-    return state
-
-def inv_shift_rows(state):
-    # 对于S-AES的16位分组，不需要实际的逆行移位
-    return state
-
-def add_key(state, key):
-    return [s ^ k for s, k in zip(state, key)]
-
-def key_expansion(key):
-    w = [(key >> 8) & 0xFF, key & 0xFF]
-    w.append(w[0] ^ RCON1 ^ ((S_BOX[w[1] >> 4] << 4) | S_BOX[w[1] & 0x0F]))
-    w.append(w[2] ^ w[1])
-    return [(w[i] >> 4, w[i] & 0x0F) for i in range(4)]
-
-# 加密和解密函数
-def encrypt(plaintext, key):
-    state = [(plaintext >> 4) & 0xF, plaintext & 0xF]
-    round_keys = key_expansion(key)
-    state = add_key(state, round_keys[0])
-    state = sub_nibbles(state)
-    state = shift_rows(state)
-    state = add_key(state, round_keys[1])
-    state = sub_nibbles(state)
-    state = shift_rows(state)
-    state = add_key(state, round_keys[2])
-    return (state[0] << 4) | state[1]
-
-def decrypt(ciphertext, key):
-    state = [(ciphertext >> 4) & 0xF, ciphertext & 0xF]
-    round_keys = key_expansion(key)
-    state = add_key(state, round_keys[2])
-    state = inv_sub_nibbles(state)
-    state = inv_shift_rows(state)
-    state = add_key(state, round_keys[1])
-    state = inv_sub_nibbles(state)
-    state = inv_shift_rows(state)
-    state = add_key(state, round_keys[0])
-    return (state[0] << 4) | state[1]
-
-# CBC模式加解密
-def generate_iv():
-    # 生成随机16位初始向量
-    return random.randint(0, 0xFFFF)
-
-def cbc_encrypt(plaintext, key, iv):
-    ciphertext = []
-    previous_block = iv
-    for i in range(0, len(plaintext), 2):  # 每次处理2字节
-        block = plaintext[i:i + 2]
-        block = block[0] << 4 | block[1] if len(block) == 2 else block[0]
-        block = block ^ previous_block  # XOR with previous ciphertext (or IV for first block)
-        encrypted_block = encrypt(block, key)  # 使用S-AES加密
-        ciphertext.append(encrypted_block)
-        previous_block = encrypted_block  # 更新previous_block
-    return ciphertext
-
-def cbc_decrypt(ciphertext, key, iv):
-    plaintext = []
-    previous_block = iv
-    for block in ciphertext:
-        decrypted_block = decrypt(block, key)  # 使用S-AES解密
-        decrypted_block ^= previous_block  # XOR with previous ciphertext (or IV for first block)
-        plaintext.append(decrypted_block >> 4)  # 提取高4位
-        plaintext.append(decrypted_block & 0xF)  # 提取低4位
-        previous_block = block  # 更新previous_block
-    return plaintext
-
-# 篡改密文
-def tamper_ciphertext(ciphertext):
-    # 简单的篡改第一个密文块
-    if len(ciphertext) > 0:
-        ciphertext[0] ^= 0xFFFF  # 将第一个密文块进行XOR修改
-    return ciphertext
+from saes.narrow import *  # noqa: F401,F403  保留原先从本脚本导入的函数
+from saes.modes import *  # noqa: F401,F403
+from saes.common import S_BOX, INV_S_BOX  # noqa: F401  原脚本中的常量
+from saes.tamper import bit_flips, iv_flips, run_experiment
+from saes.mac import encrypt_then_mac_stream, decrypt_and_verify_stream
 
 # 测试
-plaintext = [0xAB, 0xCD, 0xEF, 0x12, 0x34, 0x56]  # 一个明文消息（16位分组，拆分成字节）
-key = 0x12345678  # 使用32位密钥
-iv = generate_iv()  # 生成16位IV
-
-# CBC加密
-ciphertext = cbc_encrypt(plaintext, key, iv)
-print(f"Original Ciphertext: {[hex(c) for c in ciphertext]}")
-
-# 篡改密文
-tampered_ciphertext = tamper_ciphertext(ciphertext)
-print(f"Tampered Ciphertext: {[hex(c) for c in tampered_ciphertext]}")
-
-# CBC解密
-decrypted_plaintext = cbc_decrypt(ciphertext, key, iv)
-print(f"Decrypted Plaintext (original): {decrypted_plaintext}")
-
-# 解密篡改后的密文
-decrypted_tampered_plaintext = cbc_decrypt(tampered_ciphertext, key, iv)
-print(f"Decrypted Plaintext (tampered): {decrypted_tampered_plaintext}")
+if __name__ == "__main__":
+    plaintext = [0xAB, 0xCD, 0xEF, 0x12, 0x34, 0x56]  # 一个明文消息（16位分组，拆分成字节）
+    key = 0x12345678  # 使用32位密钥
+    iv = generate_iv()  # 生成16位IV
+
+    # CBC加密
+    ciphertext = cbc_encrypt(plaintext, key, iv)
+    print(f"Original Ciphertext: {[hex(c) for c in ciphertext]}")
+
+    # 篡改密文
+    tampered_ciphertext = tamper_ciphertext(ciphertext)
+    print(f"Tampered Ciphertext: {[hex(c) for c in tampered_ciphertext]}")
+
+    # CBC解密
+    decrypted_plaintext = cbc_decrypt(ciphertext, key, iv)
+    print(f"Decrypted Plaintext (original): {decrypted_plaintext}")
+
+    # 解密篡改后的密文
+    decrypted_tampered_plaintext = cbc_decrypt(tampered_ciphertext, key, iv)
+    print(f"Decrypted Plaintext (tampered): {decrypted_tampered_plaintext}")
+
+    # 流式CBC加解密（文件对象或mmap）
+    stream_plaintext = bytes(range(256)) * 4
+    stream_ciphertext = io.BytesIO()
+    cbc_encrypt_stream(io.BytesIO(stream_plaintext), stream_ciphertext, key, iv, chunk_size=100)
+    stream_decrypted = io.BytesIO()
+    cbc_decrypt_stream(io.BytesIO(stream_ciphertext.getvalue()), stream_decrypted, key, iv, chunk_size=100)
+    print(f"Stream round trip ok: {stream_decrypted.getvalue() == stream_plaintext}")
+
+    # CTR模式：可从任意分组位置开始解密
+    ctr_ciphertext = ctr_encrypt(stream_plaintext, key, iv)
+    print(f"CTR round trip ok: {ctr_decrypt(ctr_ciphertext, key, iv) == stream_plaintext}, "
+          f"seek ok: {ctr_decrypt(ctr_ciphertext[300:310], key, iv, start_block=300) == stream_plaintext[300:310]}")
+
+    # OFB/CFB模式：OFB密钥流按(密钥, IV)缓存一个周期，可在后台线程预先生成
+    ofb_prefetch(key, iv)
+    ofb_ciphertext = ofb_encrypt(stream_plaintext, key, iv)
+    cfb_ciphertext = cfb_encrypt(stream_plaintext, key, iv)
+    print(f"OFB round trip ok: {ofb_decrypt(ofb_ciphertext, key, iv) == stream_plaintext}, "
+          f"keystream period: {len(ofb_keystream(key, iv))}, "
+          f"CFB round trip ok: {cfb_decrypt(cfb_ciphertext, key, iv) == stream_plaintext}")
+
+    # 先加密后认证：篡改密文后无需比较明文，验证标签即可发现
+    mac_key = 0x9A3C
+    authenticated = io.BytesIO()
+    tag = encrypt_then_mac_stream(io.BytesIO(stream_plaintext), authenticated, key, mac_key, iv)
+    tampered = bytearray(authenticated.getvalue())
+    tampered[10] ^= 0x01
+    try:
+        decrypt_and_verify_stream(bytes(tampered), io.BytesIO(), key, mac_key, iv, tag)
+        print(f"CMAC tag {tag.hex()}: tampering not detected")
+    except ValueError:
+        print(f"CMAC tag {tag.hex()}: tampering detected")
+
+    # 篡改实验：翻转密文和IV的每一个比特，统计明文被破坏的情况
+    report = run_experiment(stream_plaintext, key, iv, list(bit_flips(len(stream_plaintext))) + list(iv_flips()))
+    for kind, stats in report['kinds'].items():
+        print(f"Tamper sweep ({kind}): {stats['trials']} trials, "
+              f"{stats['corrupted_bits'] / stats['trials']:.2f} corrupted bits per trial, "
+              f"corrupted block offsets {stats['block_offsets']}")
@@ -0,0 +1,24 @@
+# S-AES核心库：导入时不创建窗口、不运行示例，tkinter和NumPy只在需要的子模块中导入
+#   saes.common      共用的S盒、密钥调度常数、GF(2^4)乘法
+#   saes.basic       无列混淆的16位S-AES（S-AES1.py/S-AES2.py）
+#   saes.mixcol      带列混淆的S-AES与批量/字节接口（S-AES3.py）
+#   saes.profiling   saes.mixcol轮函数的计数/计时与状态跟踪（关闭时无开销）
+#   saes.bitslice    比特切片实现的带列混淆S-AES（布尔电路，无查表）
+#   saes.narrow      8位状态的S-AES变体（S-AES4.py/S-AES5.py）
+#   saes.multi       双重/三重加密与中间相遇攻击（S-AES4.py）
+#   saes.triple_attack 三重加密(K1-K2-K3)的多进程中间相遇密钥恢复（python -m saes.triple_attack）
+#   saes.modes       CBC/CTR/OFB/CFB工作模式与流式加解密（S-AES5.py）
+#   saes.codebook_store 磁盘上的码本/全密钥表（mmap只读共享，目录缓存按大小淘汰）
+#   saes.mac         CMAC消息认证码（hashlib风格接口）与先加密后认证的流式加密
+#   saes.tamper      CBC密文篡改/错误传播实验（只重新解密受影响的分组）
+#   saes.gui         Tk图形界面
+#   saes.brute_force 单重S-AES穷举密钥搜索（python -m saes.brute_force）
+#   saes.text_attack 针对S-AES3文本模式的唯密文密钥搜索（python -m saes.text_attack）
+#   saes.cryptanalysis S盒DDT/LAT与整个密码的差分分布、线性偏差（python -m saes.cryptanalysis）
+#   saes.verify      全部(密钥, 分组)的往返与实现一致性验证，可断点续跑（python -m saes.verify）
+#   saes.benchmark   性能基准测试（python -m saes.benchmark）
+#   saes.service     本地asyncio加解密服务，合并并发请求批量处理（python -m saes.service）
+#   saes.client      saes.service的连接池客户端
+from .common import S_BOX, INV_S_BOX, RCON1, RCON2, mult
+
+__all__ = ['S_BOX', 'INV_S_BOX', 'RCON1', 'RCON2', 'mult']
@@ -0,0 +1,110 @@
+# S-AES（无列混淆）：16位分组、16位密钥，对应S-AES1.py/S-AES2.py
+from array import array
+
+from .common import S_BOX, INV_S_BOX, RCON1, RCON2
+from .key_cache import KeyScheduleCache
+
+__all__ = [
+    'nibble_substitution', 'inverse_nibble_substitution', 'shift_row', 'inverse_shift_row',
+    'add_round_key', 'key_expansion', 'key_cache', 'expand_key', 'state_from_int', 'state_to_int',
+    's_aes_encrypt', 's_aes_decrypt', 's_aes_encrypt_with_round_keys', 's_aes_decrypt_with_round_keys',
+    'CODEBOOK_CACHE_SIZE', 'build_codebook',
+]
+
+# 对一个字节进行S盒替换
+def nibble_substitution(s):
+    return [S_BOX[b] for b in s]
+
+# 对一个字节进行逆S盒替换
+def inverse_nibble_substitution(s):
+    return [INV_S_BOX[b] for b in s]
+
+# 行移位操作
+def shift_row(s):
+    return [s[0], s[1], s[3], s[2]]
+
+# 逆行移位操作
+def inverse_shift_row(s):
+    return [s[0], s[1], s[3], s[2]]
+
+# 轮密钥加操作
+def add_round_key(s, k):
+    return [si ^ ki for si, ki in zip(s, k)]
+
+# 密钥扩展操作
+def key_expansion(key):
+    w = [0] * 6
+    w[0] = key >> 8
+    w[1] = key & 0xFF
+    w[2] = w[0] ^ RCON1 ^ (S_BOX[w[1] >> 4] << 4 | S_BOX[w[1] & 0xF])
+    w[3] = w[2] ^ w[1]
+    w[4] = w[2] ^ RCON2 ^ (S_BOX[w[3] >> 4] << 4 | S_BOX[w[3] & 0xF])
+    w[5] = w[4] ^ w[3]
+    return w
+
+# 密钥扩展缓存，同一密钥只扩展一次
+key_cache = KeyScheduleCache(key_expansion)
+
+# 取得（缓存的）轮密钥，也可用于预先扩展密钥
+def expand_key(key):
+    return key_cache.get(key)
+
+# 将整数转换为状态（4个nibble）
+def state_from_int(n):
+    return [(n >> 12) & 0xF, (n >> 8) & 0xF, (n >> 4) & 0xF, n & 0xF]
+
+# 将状态转换为整数
+def state_to_int(s):
+    return (s[0] << 12) | (s[1] << 8) | (s[2] << 4) | s[3]
+
+# S-AES加密函数，use_codebook=True时直接查该密钥的完整码本
+def s_aes_encrypt(plaintext, key, use_codebook=False):
+    if use_codebook:
+        return build_codebook(key)[0][plaintext]
+    return s_aes_encrypt_with_round_keys(plaintext, expand_key(key))
+
+# 使用已扩展的轮密钥加密
+def s_aes_encrypt_with_round_keys(plaintext, w):
+    state = add_round_key(state_from_int(plaintext), state_from_int((w[0] << 8) | w[1]))
+    state = nibble_substitution(state)
+    state = shift_row(state)
+    state = add_round_key(state, state_from_int((w[2] << 8) | w[3]))
+    state = nibble_substitution(state)
+    state = shift_row(state)
+    state = add_round_key(state, state_from_int((w[4] << 8) | w[5]))
+    return state_to_int(state)
+
+# S-AES解密函数，use_codebook=True时直接查该密钥的逆码本
+def s_aes_decrypt(ciphertext, key, use_codebook=False):
+    if use_codebook:
+        return build_codebook(key)[1][ciphertext]
+    return s_aes_decrypt_with_round_keys(ciphertext, expand_key(key))
+
+# 使用已扩展的轮密钥解密
+def s_aes_decrypt_with_round_keys(ciphertext, w):
+    state = add_round_key(state_from_int(ciphertext), state_from_int((w[4] << 8) | w[5]))
+    state = inverse_shift_row(state)
+    state = inverse_nibble_substitution(state)
+    state = add_round_key(state, state_from_int((w[2] << 8) | w[3]))
+    state = inverse_shift_row(state)
+    state = inverse_nibble_substitution(state)
+    state = add_round_key(state, state_from_int((w[0] << 8) | w[1]))
+    return state_to_int(state)
+
+# 码本缓存：{密钥: (加密表, 解密表)}，最多保留CODEBOOK_CACHE_SIZE个密钥
+CODEBOOK_CACHE_SIZE = 8
+_codebooks = {}
+
+# 为固定密钥构建完整码本（16位分组共65536个取值，整个密码就是一个置换）
+def build_codebook(key):
+    if key in _codebooks:
+        return _codebooks[key]
+    w = expand_key(key)
+    encrypt_table = array('H', [s_aes_encrypt_with_round_keys(p, w) for p in range(0x10000)])
+    decrypt_table = array('H', bytes(2 * 0x10000))
+    for p, c in enumerate(encrypt_table):
+        decrypt_table[c] = p
+    if len(_codebooks) >= CODEBOOK_CACHE_SIZE:
+        del _codebooks[next(iter(_codebooks))]  # 淘汰最早构建的码本
+    _codebooks[key] = (encrypt_table, decrypt_table)
+    return _codebooks[key]
@@ -0,0 +1,152 @@
+# S-AES各变体与攻击代码的性能基准测试，结果写成JSON便于比较不同版本
+# 用法: python -m saes.benchmark [--quick] [--repeat N] [--output bench.json] [--baseline old.json] [--skip-attack]
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from datetime import datetime, timezone
+
+from . import basic, mixcol, multi, narrow, modes
+
+# CBC测试的消息长度（分组数）
+CBC_SIZES = [16, 256, 4096]
+
+
+# 重复调用func，取最快的一轮计算单次耗时
+def measure(func, number, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, time.perf_counter() - started)
+    return best / number
+
+
+def _result(name, seconds_per_call, blocks_per_call=1, **extra):
+    result = {
+        'name': name,
+        'seconds_per_call': seconds_per_call,
+        'latency_ns': seconds_per_call / blocks_per_call * 1e9,
+        'blocks_per_call': blocks_per_call,
+        'blocks_per_second': blocks_per_call / seconds_per_call,
+    }
+    result.update(extra)
+    return result
+
+
+def block_benchmarks(number, repeat):
+    key, key32, key48 = 0x4AF4, 0x12345678, 0x123456789ABC
+    nibbles = mixcol.str_to_nibbles("AB")
+    # 名称沿用原脚本名，便于和旧的JSON结果比较
+    cases = [
+        ('S-AES2.s_aes_encrypt', lambda: basic.s_aes_encrypt(0x4142, key)),
+        ('S-AES2.s_aes_decrypt', lambda: basic.s_aes_decrypt(0x4142, key)),
+        ('S-AES2.s_aes_encrypt[codebook]', lambda: basic.s_aes_encrypt(0x4142, key, use_codebook=True)),
+        ('S-AES3.encrypt', lambda: mixcol.encrypt(nibbles, key)),
+        ('S-AES3.decrypt', lambda: mixcol.decrypt(nibbles, key)),
+        ('S-AES3.encrypt_block[ttable]', lambda: mixcol.encrypt_block(0x4142, key)),
+        ('S-AES3.decrypt_block[ttable]', lambda: mixcol.decrypt_block(0x4142, key)),
+        ('S-AES4.encrypt', lambda: narrow.encrypt(0xAB, key)),
+        ('S-AES4.decrypt', lambda: narrow.decrypt(0xAB, key)),
+        ('S-AES4.double_encrypt', lambda: multi.double_encrypt(0xAB, key32)),
+        ('S-AES4.triple_encrypt[mode=1]', lambda: multi.triple_encrypt(0xAB, key32, mode=1)),
+        ('S-AES4.triple_encrypt[mode=2]', lambda: multi.triple_encrypt(0xAB, key48, mode=2)),
+        ('S-AES4.double_encrypt[codebook]', lambda: multi.double_encrypt(0xAB, key32, use_codebook=True)),
+        ('S-AES4.triple_encrypt[mode=2,codebook]',
+         lambda: multi.triple_encrypt(0xAB, key48, mode=2, use_codebook=True)),
+    ]
+    # 码本构建时间不计入单分组延迟
+    basic.build_codebook(key)
+    multi.composite_codebook(key32, 'double')
+    multi.composite_codebook(key48, 'triple2')
+    return [_result(name, measure(func, number, repeat)) for name, func in cases]
+
+
+def cbc_benchmarks(number, repeat):
+    key, iv = 0x12345678, 0x5A5A
+    results = []
+    for blocks in CBC_SIZES:
+        plaintext = [i & 0xF for i in range(2 * blocks)]
+        ciphertext = modes.cbc_encrypt(plaintext, key, iv)
+        calls = max(1, number // blocks)
+        results.append(_result(f'S-AES5.cbc_encrypt[{blocks}]',
+                               measure(lambda: modes.cbc_encrypt(plaintext, key, iv), calls, repeat), blocks))
+        results.append(_result(f'S-AES5.cbc_decrypt[{blocks}]',
+                               measure(lambda: modes.cbc_decrypt(ciphertext, key, iv), calls, repeat), blocks))
+    return results
+
+
+def attack_benchmarks():
+    key = 0x12345678
+    ciphertext = multi.double_encrypt(0xAB, key)
+    seconds = measure(lambda: multi.meet_in_the_middle_attack(0xAB, ciphertext), 1, 1)
+    return [{'name': 'S-AES4.meet_in_the_middle_attack', 'seconds': seconds}]
+
+
+def run(quick=False, repeat=3, skip_attack=False):
+    """Run every benchmark and return the report as a dict."""
+    number = 200 if quick else 2000
+    results = block_benchmarks(number, repeat) + cbc_benchmarks(number, repeat)
+    if not skip_attack:
+        results += attack_benchmarks()
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'quick': quick,
+        'repeat': repeat,
+        'results': results,
+    }
+
+
+def _print_report(report):
+    for result in report['results']:
+        if 'latency_ns' in result:
+            print(f"{result['name']:<36} {result['latency_ns']:>12.0f} ns/block "
+                  f"{result['blocks_per_second']:>14,.0f} blocks/s")
+        else:
+            print(f"{result['name']:<36} {result['seconds']:>12.3f} s")
+
+
+# 与之前保存的JSON结果比较，>1表示比基线更快
+def compare(report, baseline):
+    """Return {name: speedup} for results present in both reports."""
+    def timings(r):
+        return {x['name']: x.get('seconds_per_call', x.get('seconds')) for x in r['results']}
+    old = timings(baseline)
+    return {name: old[name] / seconds for name, seconds in timings(report).items() if name in old}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the S-AES variants and attacks")
+    parser.add_argument('--quick', action='store_true', help="fewer iterations per measurement")
+    parser.add_argument('--repeat', type=int, default=3, help="repetitions per measurement (best is kept)")
+    parser.add_argument('--skip-attack', action='store_true', help="skip the meet-in-the-middle attack")
+    parser.add_argument('--output', help="write the JSON report to this file (default: stdout)")
+    parser.add_argument('--baseline', help="previous JSON report to compare against")
+    args = parser.parse_args(argv)
+
+    report = run(args.quick, args.repeat, args.skip_attack)
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            report['speedup'] = compare(report, json.load(f))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        _print_report(report)
+        for name, speedup in report.get('speedup', {}).items():
+            print(f"{name:<36} {speedup:>8.2f}x vs baseline")
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,183 @@
+# 比特切片（bitsliced）实现的带列混淆S-AES（与saes.mixcol结果一致）
+# N个分组转置成16个比特平面：平面i的第j位是第j个分组的第i位。S盒写成布尔电路，
+# 乘4/乘2/乘9写成异或网络，一次按位运算同时处理所有分组，且没有查表，耗时与数据无关。
+# 比特平面可以是Python整数（任意长度），也可以是NumPy uint64数组（每个字处理64个分组）。
+try:
+    import numpy as np
+except ImportError:  # 没有NumPy时使用Python整数平面
+    np = None
+
+from .common import RCON1, RCON2
+
+__all__ = [
+    'to_planes', 'from_planes', 'key_planes', 'expand_key_planes',
+    'encrypt_planes', 'decrypt_planes', 'encrypt_many', 'decrypt_many',
+]
+
+_ALL_ONES_64 = 0xFFFFFFFFFFFFFFFF
+
+
+# S盒的布尔电路（由代数标准型得到），输入输出均为低位在前的4个平面
+def _sbox(x, ones):
+    x0, x1, x2, x3 = x
+    x01, x02, x03, x12, x13, x23 = x0 & x1, x0 & x2, x0 & x3, x1 & x2, x1 & x3, x2 & x3
+    x012, x013, x023, x123 = x01 & x2, x01 & x3, x02 & x3, x12 & x3
+    return [
+        ones ^ x0 ^ x1 ^ x02 ^ x012 ^ x3 ^ x03 ^ x13 ^ x013 ^ x023 ^ x123,
+        x1 ^ x12 ^ x3 ^ x013 ^ x23 ^ x023 ^ x123,
+        x0 ^ x01 ^ x2 ^ x12 ^ x012 ^ x3 ^ x13 ^ x23 ^ x023,
+        ones ^ x0 ^ x01 ^ x012 ^ x3 ^ x03 ^ x013 ^ x23,
+    ]
+
+# 逆S盒的布尔电路
+def _inv_sbox(x, ones):
+    x0, x1, x2, x3 = x
+    x01, x02, x03, x12, x13, x23 = x0 & x1, x0 & x2, x0 & x3, x1 & x2, x1 & x3, x2 & x3
+    x012, x013, x023, x123 = x01 & x2, x01 & x3, x02 & x3, x12 & x3
+    return [
+        x0 ^ x1 ^ x01 ^ x2 ^ x02 ^ x03 ^ x13 ^ x23 ^ x023 ^ x123,
+        ones ^ x0 ^ x1 ^ x2 ^ x12 ^ x13 ^ x013 ^ x023 ^ x123,
+        x0 ^ x01 ^ x012 ^ x3 ^ x13 ^ x023 ^ x123,
+        ones ^ x0 ^ x01 ^ x2 ^ x02 ^ x12 ^ x012 ^ x3 ^ x03 ^ x013 ^ x123,
+    ]
+
+# GF(2^4)中乘常数（模x^4+x+1）都是线性变换，写成异或网络
+def _mul2(a):
+    return [a[3], a[0] ^ a[3], a[1], a[2]]
+
+def _mul4(a):
+    return [a[2], a[2] ^ a[3], a[3] ^ a[0], a[1]]
+
+def _mul9(a):
+    return [a[0] ^ a[1], a[2], a[3], a[0]]
+
+def _xor(a, b):
+    return [i ^ j for i, j in zip(a, b)]
+
+
+# 状态：4个nibble（高位nibble在前），每个nibble是低位在前的4个平面
+def _split(planes):
+    return [planes[12:16], planes[8:12], planes[4:8], planes[0:4]]
+
+def _join(nibbles):
+    return nibbles[3] + nibbles[2] + nibbles[1] + nibbles[0]
+
+def _shift_rows(s):
+    return [s[0], s[1], s[3], s[2]]
+
+def _mix_columns(s):
+    return [_xor(s[0], _mul4(s[2])), _xor(s[1], _mul4(s[3])),
+            _xor(s[2], _mul4(s[0])), _xor(s[3], _mul4(s[1]))]
+
+def _inv_mix_columns(s):
+    return [_xor(_mul9(s[0]), _mul2(s[2])), _xor(_mul9(s[1]), _mul2(s[3])),
+            _xor(_mul9(s[2]), _mul2(s[0])), _xor(_mul9(s[3]), _mul2(s[1]))]
+
+# add_key只使用轮密钥的低字节（8个平面），并重复到两个字节上
+def _add_key(s, w):
+    low, high = w[0:4], w[4:8]
+    return [_xor(s[0], high), _xor(s[1], low), _xor(s[2], high), _xor(s[3], low)]
+
+def _sub_byte(w, ones):
+    return _sbox(w[0:4], ones) + _sbox(w[4:8], ones)
+
+def _add_constant(w, constant, ones):
+    return [plane ^ ones if constant >> i & 1 else plane for i, plane in enumerate(w)]
+
+
+# 比特切片的密钥扩展；返回各轮密钥的低字节 (w1, w3, w5)
+def expand_key_planes(key_planes, ones):
+    """Expand 16 key planes into the low-byte planes of the three round keys."""
+    w0, w1 = key_planes[8:16], key_planes[0:8]
+    w2 = _xor(_add_constant(w0, RCON1, ones), _sub_byte(w1, ones))
+    w3 = _xor(w2, w1)
+    w4 = _xor(_add_constant(w2, RCON2, ones), _sub_byte(w3, ones))
+    w5 = _xor(w4, w3)
+    return w1, w3, w5
+
+def encrypt_planes(planes, round_keys, ones):
+    """Encrypt 16 bit-planes with round keys from `expand_key_planes`."""
+    state = _add_key(_split(planes), round_keys[0])
+
+    state = [_sbox(n, ones) for n in state]
+    state = _shift_rows(state)
+    state = _mix_columns(state)
+    state = _add_key(state, round_keys[1])
+
+    state = [_sbox(n, ones) for n in state]
+    state = _shift_rows(state)
+    state = _add_key(state, round_keys[2])
+    return _join(state)
+
+def decrypt_planes(planes, round_keys, ones):
+    """Decrypt 16 bit-planes with round keys from `expand_key_planes`."""
+    state = _add_key(_split(planes), round_keys[2])
+    state = _shift_rows(state)
+    state = [_inv_sbox(n, ones) for n in state]
+
+    state = _add_key(state, round_keys[1])
+    state = _inv_mix_columns(state)
+    state = _shift_rows(state)
+    state = [_inv_sbox(n, ones) for n in state]
+
+    state = _add_key(state, round_keys[0])
+    return _join(state)
+
+
+# 分组与比特平面之间的转置
+def to_planes(blocks, backend=None):
+    """Transpose 16-bit blocks into 16 bit-planes; returns (planes, ones).
+
+    backend 'numpy' packs 64 blocks per uint64 word; 'int' uses one Python
+    int per plane. The default is 'numpy' when NumPy is installed.
+    """
+    backend = backend or ('numpy' if np is not None else 'int')
+    if backend == 'numpy':
+        blocks = np.asarray(blocks, dtype=np.uint16)
+        padded = np.zeros(-(-len(blocks) // 64) * 64, dtype=np.uint16)
+        padded[:len(blocks)] = blocks
+        bits = ((padded[None, :] >> np.arange(16, dtype=np.uint16)[:, None]) & 1).astype(np.uint8)
+        packed = np.packbits(bits, axis=1, bitorder='little')
+        planes = [np.ascontiguousarray(row).view('<u8').astype(np.uint64) for row in packed]
+        return planes, np.uint64(_ALL_ONES_64)
+    if backend != 'int':
+        raise ValueError(f"Unknown backend {backend!r}")
+    blocks = [int(b) for b in blocks]
+    planes = [int(''.join('1' if b >> i & 1 else '0' for b in reversed(blocks)) or '0', 2) for i in range(16)]
+    return planes, (1 << len(blocks)) - 1
+
+def from_planes(planes, count):
+    """Transpose bit-planes back into a list (or uint16 array) of `count` blocks."""
+    if np is not None and isinstance(planes[0], np.ndarray):
+        packed = np.stack([p.astype('<u8').view(np.uint8) for p in planes])
+        bits = np.unpackbits(packed, axis=1, bitorder='little')[:, :count].astype(np.uint16)
+        return (bits << np.arange(16, dtype=np.uint16)[:, None]).sum(axis=0, dtype=np.uint16)
+    rows = [format(p, f'0{count}b')[::-1] for p in planes]
+    return [sum(1 << i for i in range(16) if rows[i][j] == '1') for j in range(count)]
+
+def key_planes(key, count, ones, backend=None):
+    """Key planes for one key shared by all blocks, or one key per block."""
+    if isinstance(key, int):
+        return [ones * (key >> i & 1) for i in range(16)]
+    planes, _ = to_planes(key, backend)
+    return planes
+
+
+def _crypt_many(blocks, key, backend, crypt_planes):
+    planes, ones = to_planes(blocks, backend)
+    count = len(blocks)
+    if not isinstance(key, int) and len(key) != count:
+        raise ValueError("Need one key per block (or a single int key)")
+    round_keys = expand_key_planes(key_planes(key, count, ones, backend), ones)
+    return from_planes(crypt_planes(planes, round_keys, ones), count)
+
+def encrypt_many(blocks, key, backend=None):
+    """Encrypt 16-bit blocks (same packing as `saes.mixcol.encrypt_many`).
+
+    `key` is a single 16-bit key or a sequence with one key per block.
+    """
+    return _crypt_many(blocks, key, backend, encrypt_planes)
+
+def decrypt_many(blocks, key, backend=None):
+    """Decrypt 16-bit blocks; `key` as in `encrypt_many`."""
+    return _crypt_many(blocks, key, backend, decrypt_planes)
@@ -0,0 +1,133 @@
+# 单重S-AES（16位密钥）穷举密钥搜索
+# 支持两种变体：saes.basic 的 s_aes_encrypt（无列混淆）与 saes.mixcol 的 encrypt（有列混淆）
+# 用法: python -m saes.brute_force --variant saes3 --workers 4 0x4142:0x50c6 0x4344:0x1f2e
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from . import mixcol
+
+VARIANTS = ('saes2', 'saes3')
+
+# 每个进程任务处理的密钥数
+CHUNK_SIZE = 4096
+
+
+# 'saes2'使用完整的16位轮密钥；'saes3'与saes.mixcol.add_key一样只用轮密钥的低字节
+def _round_keys(keys, variant):
+    if variant == 'saes2':
+        schedule = mixcol.full_key_schedule()
+    elif variant == 'saes3':
+        schedule = mixcol.all_key_schedule()
+    else:
+        raise ValueError(f"Unknown variant {variant!r}, expected one of {VARIANTS}")
+    keys = np.asarray(keys, dtype=np.intp)
+    return [k[keys] for k in schedule]
+
+# 分组在一组密钥下的加密结果，轮函数与saes.mixcol的批量接口共用（'saes2'跳过列混淆）
+def encrypt_under_keys(plaintext, keys, variant='saes2'):
+    """Encrypt 16-bit blocks under the matching keys in `keys` (vectorized, NumPy broadcasting).
+
+    'saes2' matches `saes.basic.s_aes_encrypt`. 'saes3' matches
+    `saes.mixcol.encrypt` with the 4-nibble state packed high nibble first; like its
+    `add_key`, only the low byte of each round key is used.
+    """
+    k0, k1, k2 = _round_keys(keys, variant)
+    return mixcol._encrypt_state(np.asarray(plaintext, dtype=np.uint16), k0, k1, k2, mix=variant == 'saes3')
+
+# 逆过程：分组在一组密钥下的解密结果
+def decrypt_under_keys(ciphertext, keys, variant='saes2'):
+    """Decrypt 16-bit blocks under the matching keys in `keys` (inverse of `encrypt_under_keys`)."""
+    k0, k1, k2 = _round_keys(keys, variant)
+    return mixcol._decrypt_state(np.asarray(ciphertext, dtype=np.uint16), k0, k1, k2, mix=variant == 'saes3')
+
+
+# 检查一段密钥：先用第一组明密文批量筛选，再用其余明密文验证幸存者（进程池任务）
+def _search_range(task):
+    pairs, variant, start, stop = task
+    keys = np.arange(start, stop, dtype=np.uint32).astype(np.uint16)
+    for plaintext, ciphertext in pairs:
+        keys = keys[encrypt_under_keys(plaintext, keys, variant) == ciphertext]
+        if not keys.size:
+            break
+    return [int(k) for k in keys]
+
+
+def iter_recover_keys(pairs, variant='saes2', workers=None, limit=None):
+    """Yield every 16-bit key consistent with all (plaintext, ciphertext) pairs.
+
+    The keyspace is split into chunks that are searched in a process pool of
+    `workers` processes (1 runs in-process); keys are yielded as each chunk
+    finishes. Searching stops early once `limit` keys have been yielded.
+    """
+    if not pairs:
+        raise ValueError("At least one plaintext/ciphertext pair is required")
+    if variant not in VARIANTS:
+        raise ValueError(f"Unknown variant {variant!r}, expected one of {VARIANTS}")
+    pairs = [(int(p) & 0xFFFF, int(c) & 0xFFFF) for p, c in pairs]
+    workers = workers or os.cpu_count() or 1
+    tasks = [(pairs, variant, start, min(start + CHUNK_SIZE, 0x10000))
+             for start in range(0, 0x10000, CHUNK_SIZE)]
+    found = 0
+
+    if workers == 1:
+        for task in tasks:
+            for key in _search_range(task):
+                yield key
+                found += 1
+                if limit is not None and found >= limit:
+                    return
+        return
+
+    with ProcessPoolExecutor(workers) as pool:
+        futures = [pool.submit(_search_range, task) for task in tasks]
+        try:
+            for future in as_completed(futures):
+                for key in future.result():
+                    yield key
+                    found += 1
+                    if limit is not None and found >= limit:
+                        return
+        finally:
+            for future in futures:
+                future.cancel()
+
+
+def recover_keys(pairs, variant='saes2', workers=None, limit=None):
+    """Return the sorted list of 16-bit keys consistent with all pairs."""
+    return sorted(iter_recover_keys(pairs, variant, workers, limit))
+
+
+# 解析 "明文:密文" 形式的参数，支持0x/0b前缀
+def _parse_pair(text):
+    try:
+        plaintext, ciphertext = text.split(':')
+        return int(plaintext, 0), int(ciphertext, 0)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Expected PLAINTEXT:CIPHERTEXT, got {text!r}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Exhaustive 16-bit key search for single S-AES")
+    parser.add_argument('pairs', nargs='+', type=_parse_pair, help="known pair as PLAINTEXT:CIPHERTEXT")
+    parser.add_argument('--variant', choices=VARIANTS, default='saes2',
+                        help="saes2: saes.basic.s_aes_encrypt, saes3: saes.mixcol.encrypt")
+    parser.add_argument('--workers', type=int, default=None, help="number of processes (default: CPU count)")
+    parser.add_argument('--first', action='store_true', help="stop after the first key found")
+    args = parser.parse_args(argv)
+
+    found = 0
+    for key in iter_recover_keys(args.pairs, args.variant, args.workers, 1 if args.first else None):
+        print(f"{key:#06x} {key:016b}", flush=True)
+        found += 1
+    if not found:
+        print("Key not found", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
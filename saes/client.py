@@ -0,0 +1,110 @@
+# saes.service的客户端：线程安全的连接池，每次请求从池中取一个连接，用完放回
+# 例: client = CipherClient(port=8765); client.encrypt(b'data', 0x4AF5)
+import itertools
+import queue
+import socket
+import threading
+from contextlib import contextmanager
+
+from .service import (LENGTH, REQUEST_HEADER, RESPONSE_HEADER, STATUS_OK, OP_ENCRYPT, OP_DECRYPT,
+                      OP_CBC_ENCRYPT, OP_CBC_DECRYPT)
+
+__all__ = ['ServiceError', 'CipherClient']
+
+
+class ServiceError(Exception):
+    """Raised when the service rejects a request."""
+
+
+def _recv_exactly(sock, size):
+    data = bytearray()
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError("Connection closed by server")
+        data += chunk
+    return bytes(data)
+
+
+class CipherClient:
+    """Blocking client for `saes.service` with a pool of reusable connections.
+
+    Connect with `host`/`port` or a Unix socket `path`. Safe to share between
+    threads; at most `pool_size` connections are kept open.
+    """
+
+    def __init__(self, host='127.0.0.1', port=8765, path=None, pool_size=4, timeout=10.0):
+        self.host, self.port, self.path = host, port, path
+        self.timeout = timeout
+        self._pool = queue.LifoQueue(maxsize=pool_size)
+        self._ids = itertools.count(1)
+        self._ids_lock = threading.Lock()
+
+    def _connect(self):
+        if self.path:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            sock.connect(self.path)
+        else:
+            sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return sock
+
+    # 从池中取出连接；出错的连接直接关闭，不放回池中
+    @contextmanager
+    def _connection(self):
+        try:
+            sock = self._pool.get_nowait()
+        except queue.Empty:
+            sock = self._connect()
+        try:
+            yield sock
+        except BaseException:
+            sock.close()
+            raise
+        try:
+            self._pool.put_nowait(sock)
+        except queue.Full:
+            sock.close()
+
+    def request(self, op, data, key, iv=0):
+        """Send one request and return the result bytes."""
+        with self._ids_lock:
+            request_id = next(self._ids) & 0xFFFFFFFF
+        payload = REQUEST_HEADER.pack(request_id, op, key, iv) + bytes(data)
+        with self._connection() as sock:
+            sock.sendall(LENGTH.pack(len(payload)) + payload)
+            (length,) = LENGTH.unpack(_recv_exactly(sock, LENGTH.size))
+            response = _recv_exactly(sock, length)
+        reply_id, status = RESPONSE_HEADER.unpack_from(response)
+        if reply_id != request_id:
+            raise ConnectionError(f"Response {reply_id} does not match request {request_id}")
+        body = response[RESPONSE_HEADER.size:]
+        if status != STATUS_OK:
+            raise ServiceError(body.decode('utf-8', 'replace'))
+        return body
+
+    def encrypt(self, data, key):
+        return self.request(OP_ENCRYPT, data, key)
+
+    def decrypt(self, data, key):
+        return self.request(OP_DECRYPT, data, key)
+
+    def cbc_encrypt(self, data, key, iv):
+        return self.request(OP_CBC_ENCRYPT, data, key, iv)
+
+    def cbc_decrypt(self, data, key, iv):
+        return self.request(OP_CBC_DECRYPT, data, key, iv)
+
+    def close(self):
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                return
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
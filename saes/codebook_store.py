@@ -0,0 +1,251 @@
+# 磁盘上的码本/全密钥表：写一次，之后各进程用只读mmap打开，通过页缓存共享同一份数据
+# 例: store = CodebookStore('/tmp/saes-tables')
+#     table = store.get('mixcol', 0x4AF5, 'encrypt')   # table[p] 是分组p的密文
+#
+# 文件格式：64字节头 + 表数据（本机字节序）
+#   魔数 版本 元素字节数 方向(0加密/1解密) 变体名 密钥 元素个数 BLAKE2b摘要 字节序
+import hashlib
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+
+from . import basic, mixcol, modes, narrow
+
+__all__ = [
+    'CodebookError', 'BUILDERS', 'DIRECTIONS', 'build_table', 'write_table', 'CodebookTable',
+    'open_table', 'CodebookStore', 'DEFAULT_MAX_BYTES',
+]
+
+MAGIC = b'SAESCB\x00\x00'
+VERSION = 1
+HEADER = struct.Struct('<8sHBB16sQI16sc7x')
+DIRECTIONS = ('encrypt', 'decrypt')
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+class CodebookError(ValueError):
+    """Raised when a table file is malformed or fails its integrity check."""
+
+
+def _digest(data):
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+# 各种表的构建函数：(密钥, 是否解密) -> 表
+# *_all_keys 表的“密钥”字段存放分组，表下标是密钥
+def _basic_table(key, decrypting):
+    return basic.build_codebook(key)[1 if decrypting else 0]
+
+def _mixcol_table(key, decrypting):
+    crypt = mixcol.decrypt_block if decrypting else mixcol.encrypt_block
+    return array('H', [crypt(block, key) for block in range(0x10000)])
+
+def _narrow_table(key, decrypting):
+    return modes.byte_tables(key)[1 if decrypting else 0]
+
+def _narrow_all_keys(block, decrypting):
+    crypt = narrow.decrypt_all_keys if decrypting else narrow.encrypt_all_keys
+    return crypt(block).astype('u1')
+
+def _mixcol_all_keys(block, decrypting):
+    crypt = mixcol.decrypt_all_keys if decrypting else mixcol.encrypt_all_keys
+    return crypt(block)
+
+BUILDERS = {
+    'basic': _basic_table,
+    'mixcol': _mixcol_table,
+    'narrow': _narrow_table,
+    'narrow_all_keys': _narrow_all_keys,
+    'mixcol_all_keys': _mixcol_all_keys,
+}
+
+def build_table(variant, key, direction):
+    """Build a table in memory; returns a bytes-like object (1 or 2 byte items)."""
+    if variant not in BUILDERS:
+        raise ValueError(f"Unknown variant {variant!r}; choose from {', '.join(BUILDERS)}")
+    if direction not in DIRECTIONS:
+        raise ValueError(f"direction must be one of {DIRECTIONS}")
+    return BUILDERS[variant](key, direction == 'decrypt')
+
+
+# 原子写入：先写临时文件再改名，其他进程不会读到写了一半的文件
+def write_table(path, variant, key, direction, table):
+    """Write `table` with its header to `path` atomically."""
+    view = memoryview(table).cast('B')
+    itemsize = memoryview(table).itemsize
+    header = HEADER.pack(MAGIC, VERSION, itemsize, DIRECTIONS.index(direction), variant.encode('ascii'),
+                         key, len(view) // itemsize, _digest(view), sys.byteorder[0].encode('ascii'))
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(header)
+            f.write(view)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+class CodebookTable:
+    """A table file mapped read-only; `table` is a memoryview of its entries."""
+
+    def __init__(self, path, verify=True):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._load(verify)
+        except BaseException:
+            self._mmap.close()
+            raise
+
+    def _load(self, verify):
+        if len(self._mmap) < HEADER.size:
+            raise CodebookError(f"{self.path}: file too short")
+        (magic, version, itemsize, direction, variant, self.key, count, digest,
+         order) = HEADER.unpack_from(self._mmap)
+        if magic != MAGIC or version != VERSION:
+            raise CodebookError(f"{self.path}: not a codebook file (or unsupported version)")
+        if itemsize not in (1, 2) or direction >= len(DIRECTIONS) or order != sys.byteorder[0].encode('ascii'):
+            raise CodebookError(f"{self.path}: unsupported item size, direction or byte order")
+        if len(self._mmap) != HEADER.size + count * itemsize:
+            raise CodebookError(f"{self.path}: truncated table")
+        body = memoryview(self._mmap)[HEADER.size:]
+        if verify and _digest(body) != digest:
+            body.release()
+            raise CodebookError(f"{self.path}: checksum mismatch")
+        self.variant = variant.rstrip(b'\0').decode('ascii')
+        self.direction = DIRECTIONS[direction]
+        self.table = body.cast('B' if itemsize == 1 else 'H')
+        body.release()
+
+    # 调用者手里的切片、cast或NumPy数组仍引用映射时mmap不能关闭（BufferError）
+    def close(self):
+        """Release `table` and unmap the file.
+
+        Slices, casts or NumPy arrays taken from `table` keep the mapping
+        alive: if any still exist, the file stays mapped until they are
+        garbage collected. Release them first to unmap immediately.
+        """
+        try:
+            self.table.release()
+            self._mmap.close()
+        except BufferError:
+            pass  # 最后一个视图被回收时mmap自行解除映射
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def open_table(path, verify=True):
+    """Open a table file read-only; raises `CodebookError` if it is invalid."""
+    return CodebookTable(path, verify)
+
+
+class CodebookStore:
+    """Directory cache of table files shared by every process that opens it.
+
+    Missing or corrupt tables are built and written on first use. When the
+    directory holds more than `max_bytes`, the least recently used files are
+    deleted (processes that already mapped them keep their mapping).
+    """
+
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_BYTES, verify=True):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.verify = verify
+        self.hits = 0
+        self.misses = 0
+        self._open = {}
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, variant, key, direction='encrypt'):
+        return os.path.join(self.directory, f'{variant}-{direction}-{key:012x}.cb')
+
+    def get(self, variant, key, direction='encrypt'):
+        """Return the table for (variant, key, direction) as a read-only memoryview.
+
+        The view is released by `close` or `clear`; see `CodebookTable.close`.
+        """
+        ident = (variant, key, direction)
+        if ident in self._open:
+            self.hits += 1
+            return self._open[ident].table
+        path = self.path(variant, key, direction)
+        table = None
+        try:
+            table = open_table(path, self.verify)
+            if (table.variant, table.key, table.direction) != ident:
+                table.close()
+                table = None
+        except (FileNotFoundError, CodebookError):
+            pass
+        if table is None:
+            self.misses += 1
+            write_table(path, variant, key, direction, build_table(variant, key, direction))
+            table = open_table(path, verify=False)
+            self.evict(keep=path)
+        else:
+            self.hits += 1
+            os.utime(path)  # 记录最近使用时间，供淘汰使用
+        self._open[ident] = table
+        return table.table
+
+    def _files(self):
+        files = []
+        for name in os.listdir(self.directory):
+            if name.endswith('.cb'):
+                path = os.path.join(self.directory, name)
+                try:
+                    st = os.stat(path)
+                except FileNotFoundError:  # 其他进程刚刚删除
+                    continue
+                files.append((st.st_mtime, st.st_size, path))
+        return sorted(files)
+
+    # 删除最久未使用的文件，直到总大小不超过max_bytes
+    def evict(self, keep=None):
+        """Delete least recently used files until the directory fits `max_bytes`."""
+        files = self._files()
+        total = sum(size for _, size, _ in files)
+        for _, size, path in files:
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+        return total
+
+    def clear(self):
+        """Close the tables opened by this process and delete every file."""
+        self.close()
+        for _, _, path in self._files():
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+
+    def close(self):
+        for table in self._open.values():
+            table.close()
+        self._open.clear()
+
+    def stats(self):
+        files = self._files()
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'files': len(files),
+            'bytes': sum(size for _, size, _ in files),
+            'max_bytes': self.max_bytes,
+        }
@@ -0,0 +1,32 @@
+# 各S-AES变体共用的S盒、密钥调度常数和GF(2^4)乘法
+__all__ = ['S_BOX', 'INV_S_BOX', 'RCON1', 'RCON2', 'mult', 'GF_MUL', 'sub_byte']
+
+# 定义S-AES的S盒和逆S盒
+S_BOX = [0x9, 0x4, 0xA, 0xB, 0xD, 0x1, 0x8, 0x5, 0x6, 0x2, 0x0, 0x3, 0xC, 0xE, 0xF, 0x7]
+INV_S_BOX = [S_BOX.index(x) for x in range(16)]
+
+# 定义密钥调度常数
+RCON1, RCON2 = 0x80, 0x30
+
+
+# 在GF(2^4)域中进行乘法运算
+def mult(p1, p2):
+    """Galois Field (GF(2^4)) multiplication of p1 and p2."""
+    p = 0
+    while p2:
+        if p2 & 0x1:
+            p ^= p1
+        p1 <<= 1
+        if p1 & 0x10:
+            p1 ^= 0b11  # x^4 + x + 1 (modulus polynomial)
+        p2 >>= 1
+    return p & 0xF
+
+# 预先计算的GF(2^4)乘法表：GF_MUL[a][b] == mult(a, b)
+GF_MUL = [[mult(a, b) for b in range(16)] for a in range(16)]
+
+
+# 对一个字节的两个nibble做S盒替换（密钥扩展使用）
+def sub_byte(b):
+    """Substitute both nibbles of a byte using the S-Box."""
+    return S_BOX[b >> 4] << 4 | S_BOX[b & 0xF]
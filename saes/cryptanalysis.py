@@ -0,0 +1,196 @@
+# 差分与线性密码分析：S盒的差分分布表(DDT)与线性逼近表(LAT)，
+# 以及整个密码的差分分布、线性逼近偏差（穷举全部(密钥, 明文)对或随机抽样，按密钥分块向量化）
+# 变体与saes.brute_force相同：'saes2'（无列混淆，S-AES1/2）和 'saes3'（有列混淆，S-AES3）
+# 用法: python -m saes.cryptanalysis --variant saes3 --delta 0x0001 --mask 0x000F:0x000F --samples 1000000
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .brute_force import VARIANTS, encrypt_under_keys
+from .common import S_BOX
+
+__all__ = [
+    'difference_distribution_table', 'linear_approximation_table', 'differential_uniformity', 'linearity',
+    'best_entries', 'KEY_CHUNK', 'differential_distribution', 'linear_bias',
+]
+
+# 穷举时每次向量化处理的密钥数（每个密钥对应65536个明文）
+KEY_CHUNK = 32
+# 抽样时每次处理的(密钥, 明文)对数
+SAMPLE_CHUNK = 1 << 20
+
+
+def _parity(x):
+    return bin(x).count('1') & 1
+
+# DDT[a][b]：满足 S(x) ^ S(x ^ a) == b 的x的个数
+def difference_distribution_table(sbox=S_BOX):
+    """Return the difference distribution table of a 4-bit S-box."""
+    table = [[0] * 16 for _ in range(16)]
+    for a in range(16):
+        for x in range(16):
+            table[a][sbox[x] ^ sbox[x ^ a]] += 1
+    return table
+
+# LAT[a][b]：满足 a·x == b·S(x) 的x的个数减8（即偏差乘16）
+def linear_approximation_table(sbox=S_BOX):
+    """Return the linear approximation table of a 4-bit S-box (counts minus 8)."""
+    return [[sum(_parity(x & a) == _parity(sbox[x] & b) for x in range(16)) - 8 for b in range(16)]
+            for a in range(16)]
+
+def differential_uniformity(ddt):
+    """Largest DDT entry for a non-zero input difference."""
+    return max(max(row) for row in ddt[1:])
+
+def linearity(lat):
+    """Largest absolute LAT entry for a non-zero output mask."""
+    return max(abs(v) for row in lat for v in row[1:])
+
+# 表中绝对值最大的若干项（跳过第0行、第0列）
+def best_entries(table, count=5):
+    """Return the `count` largest-magnitude entries as (input, output, value)."""
+    entries = [(a, b, v) for a, row in enumerate(table) for b, v in enumerate(row) if a and b]
+    return sorted(entries, key=lambda e: -abs(e[2]))[:count]
+
+
+# 全部65536个明文在一组密钥下的加密结果，形状为 (密钥数, 65536)
+_PLAINTEXTS = np.arange(0x10000, dtype=np.uint16)
+
+def _codebooks(keys, variant):
+    return encrypt_under_keys(_PLAINTEXTS[None, :], np.asarray(keys, dtype=np.uint16)[:, None], variant)
+
+# 16位数的奇偶性表
+_PARITY = np.zeros(0x10000, dtype=np.uint8)
+for _bit in range(16):
+    _PARITY ^= ((_PLAINTEXTS >> _bit) & 1).astype(np.uint8)
+del _bit
+
+
+def _differential_chunk(task):
+    variant, delta_in, keys = task
+    codebooks = _codebooks(keys, variant)
+    return np.bincount((codebooks ^ codebooks[:, _PLAINTEXTS ^ delta_in]).ravel(), minlength=0x10000)
+
+def _differential_sample(task):
+    variant, delta_in, seed, count = task
+    rng = np.random.default_rng(seed)
+    keys = rng.integers(0, 0x10000, count, dtype=np.uint16)
+    plaintexts = rng.integers(0, 0x10000, count, dtype=np.uint16)
+    out = encrypt_under_keys(plaintexts, keys, variant) ^ encrypt_under_keys(plaintexts ^ delta_in, keys, variant)
+    return np.bincount(out, minlength=0x10000)
+
+def _linear_chunk(task):
+    variant, in_mask, out_mask, keys = task
+    codebooks = _codebooks(keys, variant)
+    relation = _PARITY[_PLAINTEXTS & in_mask][None, :] ^ _PARITY[codebooks & out_mask]
+    return 0x10000 - relation.sum(axis=1, dtype=np.int64)
+
+def _linear_sample(task):
+    variant, in_mask, out_mask, seed, count = task
+    rng = np.random.default_rng(seed)
+    keys = rng.integers(0, 0x10000, count, dtype=np.uint16)
+    plaintexts = rng.integers(0, 0x10000, count, dtype=np.uint16)
+    relation = _PARITY[plaintexts & in_mask] ^ _PARITY[encrypt_under_keys(plaintexts, keys, variant) & out_mask]
+    return np.array([count - int(relation.sum(dtype=np.int64))])
+
+def _map(func, tasks, workers):
+    if workers == 1:
+        return map(func, tasks)
+    pool = ProcessPoolExecutor(workers)
+    try:
+        return list(pool.map(func, tasks))
+    finally:
+        pool.shutdown()
+
+def _key_tasks(keys, *args):
+    keys = np.arange(0x10000) if keys is None else np.asarray(keys)
+    return [args + (keys[i:i + KEY_CHUNK],) for i in range(0, len(keys), KEY_CHUNK)]
+
+def _sample_tasks(samples, seed, *args):
+    seeds = np.random.SeedSequence(seed).spawn(-(-samples // SAMPLE_CHUNK))
+    return [args + (s, min(SAMPLE_CHUNK, samples - i * SAMPLE_CHUNK)) for i, s in enumerate(seeds)]
+
+
+def differential_distribution(delta_in, variant='saes3', keys=None, samples=None, seed=None, workers=1):
+    """Count output differences of the full cipher for input difference `delta_in`.
+
+    By default every plaintext is tried under every key in `keys` (all 65536
+    keys: the whole 2^32 space). With `samples`, that many random
+    (key, plaintext) pairs are used instead. Returns (counts, total) where
+    counts[d] is the number of pairs with output difference d.
+    """
+    if variant not in VARIANTS:
+        raise ValueError(f"Unknown variant {variant!r}, expected one of {VARIANTS}")
+    workers = workers or os.cpu_count() or 1
+    if samples:
+        tasks = _sample_tasks(samples, seed, variant, delta_in)
+        func = _differential_sample
+    else:
+        tasks = _key_tasks(keys, variant, delta_in)
+        func = _differential_chunk
+    counts = np.zeros(0x10000, dtype=np.int64)
+    for part in _map(func, tasks, workers):
+        counts += part
+    return counts, int(counts.sum())
+
+def linear_bias(in_mask, out_mask, variant='saes3', keys=None, samples=None, seed=None, workers=1):
+    """Bias of the approximation parity(p & in_mask) == parity(E(p) & out_mask).
+
+    Exhaustive by default (as in `differential_distribution`); the result then
+    also holds the bias under each key ('per_key', a float array) since linear
+    biases depend on the key. Returns a dict with 'matches', 'total', 'bias'.
+    """
+    if variant not in VARIANTS:
+        raise ValueError(f"Unknown variant {variant!r}, expected one of {VARIANTS}")
+    workers = workers or os.cpu_count() or 1
+    if samples:
+        matches = sum(int(part[0]) for part in _map(_linear_sample, _sample_tasks(samples, seed, variant,
+                                                                                  in_mask, out_mask), workers))
+        return {'matches': matches, 'total': samples, 'bias': matches / samples - 0.5}
+    per_key = np.concatenate(list(_map(_linear_chunk, _key_tasks(keys, variant, in_mask, out_mask), workers)))
+    total = len(per_key) * 0x10000
+    matches = int(per_key.sum())
+    return {'matches': matches, 'total': total, 'bias': matches / total - 0.5,
+            'per_key': per_key / 0x10000 - 0.5}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Differential and linear cryptanalysis of S-AES")
+    parser.add_argument('--variant', choices=VARIANTS, default='saes3')
+    parser.add_argument('--delta', type=lambda s: int(s, 0), help="input difference for the full cipher")
+    parser.add_argument('--mask', help="linear approximation IN:OUT masks, e.g. 0x000F:0x000F")
+    parser.add_argument('--samples', type=int, help="random (key, plaintext) pairs instead of all 2^32")
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument('--top', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    ddt, lat = difference_distribution_table(), linear_approximation_table()
+    print(f"S-box differential uniformity: {differential_uniformity(ddt)}/16, "
+          f"best differentials: {best_entries(ddt, args.top)}")
+    print(f"S-box linearity: {linearity(lat)}/16, best approximations: {best_entries(lat, args.top)}")
+
+    if args.delta is not None:
+        counts, total = differential_distribution(args.delta, args.variant, samples=args.samples,
+                                                  seed=args.seed, workers=args.workers)
+        best = np.argsort(counts)[::-1][:args.top]
+        print(f"{args.variant} input difference {args.delta:#06x} over {total} pairs:")
+        for d in best:
+            print(f"  -> {int(d):#06x}  p = {counts[d] / total:.6f}")
+    if args.mask:
+        in_mask, out_mask = (int(x, 0) for x in args.mask.split(':'))
+        result = linear_bias(in_mask, out_mask, args.variant, samples=args.samples,
+                             seed=args.seed, workers=args.workers)
+        print(f"{args.variant} mask {in_mask:#06x} -> {out_mask:#06x}: bias {result['bias']:+.6f} "
+              f"over {result['total']} pairs")
+        if 'per_key' in result:
+            print(f"  per-key |bias|: max {np.abs(result['per_key']).max():.6f}, "
+                  f"mean {np.abs(result['per_key']).mean():.6f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,403 @@
+# S-AES的Tk图形界面；tkinter只在启动界面时才导入，导入本模块没有副作用
+import sys
+import threading
+import time
+from array import array
+
+from .basic import s_aes_encrypt, s_aes_decrypt, build_codebook
+from .mixcol import (encrypt, decrypt, str_to_nibbles, nibbles_to_str, encrypt_into, decrypt_into,
+                     pad_bytes, unpad_bytes, BLOCK_SIZE, TEXT_ENCODING)
+
+__all__ = ['run_decryptor', 'run_binary_gui', 'run_text_gui', 'BULK_CHUNK_SIZE', 'BulkJob', 'make_bulk_job']
+
+# 批量模式每次处理的字节数，处理完一块更新一次进度并检查是否取消
+BULK_CHUNK_SIZE = 64 * 1024
+# 界面轮询后台任务进度的间隔（毫秒）
+POLL_INTERVAL_MS = 100
+
+
+# 后台批量加解密任务：工作线程分块原地处理数据，界面通过after()轮询done/result/error
+class BulkJob:
+    """Encrypt or decrypt a buffer on a worker thread in cancellable chunks."""
+
+    def __init__(self, data, prepare, finish, chunk_size=BULK_CHUNK_SIZE):
+        self.data = bytearray(data)
+        self.prepare = prepare  # 在工作线程中调用，返回原地处理一块memoryview的函数
+        self.finish = finish  # 处理完成后对整个缓冲区的收尾（如去填充）
+        self.chunk_size = chunk_size - chunk_size % BLOCK_SIZE
+        self.total = len(self.data)
+        self.done = 0
+        self.result = None
+        self.error = None
+        self.started = None
+        self.finished = None
+        self._cancel = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self.started = time.perf_counter()
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        self._cancel.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    @property
+    def running(self):
+        return self._thread.is_alive()
+
+    # 已处理字节数/耗时
+    def throughput(self):
+        """Return the processing rate so far in bytes per second."""
+        if self.started is None:
+            return 0.0
+        elapsed = (self.finished or time.perf_counter()) - self.started
+        return self.done / elapsed if elapsed > 0 else 0.0
+
+    def _run(self):
+        try:
+            crypt_chunk = self.prepare()
+            view = memoryview(self.data)
+            for start in range(0, self.total, self.chunk_size):
+                if self._cancel.is_set():
+                    return
+                crypt_chunk(view[start:start + self.chunk_size])
+                self.done = min(start + self.chunk_size, self.total)
+            view.release()
+            self.result = self.finish(self.data)
+        except Exception as e:  # 交给界面线程显示
+            self.error = e
+        finally:
+            self.finished = time.perf_counter()
+
+
+# 用码本逐分组查表，原地处理一块2字节大端分组
+def _codebook_crypt(table):
+    def crypt_chunk(view):
+        blocks = array('H', bytes(view))
+        if sys.byteorder == 'little':
+            blocks.byteswap()
+        blocks = array('H', map(table.__getitem__, blocks))
+        if sys.byteorder == 'little':
+            blocks.byteswap()
+        view[:] = blocks.tobytes()
+    return crypt_chunk
+
+
+def make_bulk_job(data, key, variant='mixcol', decrypting=False, chunk_size=BULK_CHUNK_SIZE, store=None):
+    """Build a (not yet started) BulkJob for the 'basic' or 'mixcol' cipher.
+
+    Encryption pads the data to whole blocks; decryption strips the padding.
+    For 'basic', an optional `saes.codebook_store.CodebookStore` supplies the
+    codebook instead of building it in memory; it is read from the job's
+    worker thread. 'mixcol' does not use a codebook and ignores `store`.
+    """
+    if decrypting and len(data) % BLOCK_SIZE:
+        raise ValueError(f"Ciphertext length must be a multiple of {BLOCK_SIZE} bytes")
+    if variant == 'basic' and store is not None:
+        prepare = lambda: _codebook_crypt(store.get('basic', key, 'decrypt' if decrypting else 'encrypt'))
+    elif variant == 'basic':
+        prepare = lambda: _codebook_crypt(build_codebook(key)[1 if decrypting else 0])
+    elif variant == 'mixcol':
+        crypt_into = decrypt_into if decrypting else encrypt_into
+        prepare = lambda: (lambda view: crypt_into(view, key))
+    else:
+        raise ValueError(f"Unknown variant {variant!r}")
+    if decrypting:
+        return BulkJob(data, prepare, unpad_bytes, chunk_size)
+    return BulkJob(pad_bytes(data), prepare, bytes, chunk_size)
+
+
+# 批量模式面板：打开文件或粘贴任意长度文本，在后台线程中加解密
+def _bulk_panel(parent, tk, get_key, variant):
+    from tkinter import filedialog, messagebox, ttk
+
+    frame = tk.LabelFrame(parent, text="批量模式")
+    source = {'data': None, 'name': None}
+    job = {'current': None}
+
+    tk.Label(frame, text="输入（粘贴文本；解密时粘贴十六进制密文）:").grid(row=0, column=0, columnspan=4, sticky=tk.W)
+    input_text = tk.Text(frame, height=5, width=60)
+    input_text.grid(row=1, column=0, columnspan=4, sticky=tk.EW)
+
+    file_label = tk.Label(frame, text="未选择文件")
+    file_label.grid(row=2, column=1, columnspan=3, sticky=tk.W)
+
+    output_format = tk.StringVar(value='hex')
+    tk.Label(frame, text="输出格式:").grid(row=3, column=0, sticky=tk.W)
+    for column, (label, value) in enumerate([("十六进制", 'hex'), ("文本", 'text'), ("二进制文件", 'binary')], 1):
+        tk.Radiobutton(frame, text=label, variable=output_format, value=value).grid(row=3, column=column, sticky=tk.W)
+
+    progress = ttk.Progressbar(frame, maximum=1.0)
+    progress.grid(row=5, column=0, columnspan=4, sticky=tk.EW)
+    status_label = tk.Label(frame, text="就绪")
+    status_label.grid(row=6, column=0, columnspan=4, sticky=tk.W)
+
+    tk.Label(frame, text="输出:").grid(row=7, column=0, columnspan=4, sticky=tk.W)
+    output_text = tk.Text(frame, height=5, width=60)
+    output_text.grid(row=8, column=0, columnspan=4, sticky=tk.EW)
+
+    def open_file():
+        filename = filedialog.askopenfilename()
+        if filename:
+            with open(filename, 'rb') as f:
+                source['data'], source['name'] = f.read(), filename
+            file_label.config(text=f"{filename} ({len(source['data'])} bytes)")
+
+    def clear_file():
+        source['data'] = source['name'] = None
+        file_label.config(text="未选择文件")
+
+    def show_result(result):
+        output_text.delete('1.0', tk.END)
+        if output_format.get() == 'binary':
+            filename = filedialog.asksaveasfilename()
+            if filename:
+                with open(filename, 'wb') as f:
+                    f.write(result)
+                output_text.insert(tk.END, f"Wrote {len(result)} bytes to {filename}")
+        elif output_format.get() == 'text':
+            output_text.insert(tk.END, result.decode(TEXT_ENCODING))
+        else:
+            output_text.insert(tk.END, result.hex())
+
+    # 轮询后台任务，更新进度条和吞吐率
+    def poll():
+        current = job['current']
+        fraction = current.done / current.total if current.total else 1.0
+        progress['value'] = fraction
+        status_label.config(text=f"{fraction:.0%}  {current.throughput() / 1024:,.0f} KB/s")
+        if current.running:
+            parent.after(POLL_INTERVAL_MS, poll)
+            return
+        set_busy(False)
+        if current.error is not None:
+            status_label.config(text="失败")
+            messagebox.showerror("Error", f"Bulk operation failed: {current.error}")
+        elif current.cancelled:
+            status_label.config(text="已取消")
+        else:
+            status_label.config(text=f"完成: {current.total} bytes, {current.throughput() / 1024:,.0f} KB/s")
+            show_result(current.result)
+
+    def start(decrypting):
+        try:
+            key = get_key()
+            if source['data'] is not None:
+                data = source['data']
+            elif decrypting:
+                data = bytes.fromhex(input_text.get('1.0', tk.END).strip())
+            else:
+                # 与saes.mixcol的文本接口一致，每个字符一个字节；超出latin-1的字符报错
+                data = input_text.get('1.0', 'end-1c').encode(TEXT_ENCODING)
+            job['current'] = make_bulk_job(data, key, variant, decrypting).start()
+        except ValueError as e:
+            messagebox.showerror("Error", f"Invalid input: {e}")
+            return
+        set_busy(True)
+        parent.after(POLL_INTERVAL_MS, poll)
+
+    def cancel():
+        if job['current'] is not None:
+            job['current'].cancel()
+
+    buttons = tk.Frame(frame)
+    buttons.grid(row=4, column=0, columnspan=4, sticky=tk.W)
+    tk.Button(frame, text="打开文件…", command=open_file).grid(row=2, column=0, sticky=tk.W)
+    encrypt_button = tk.Button(buttons, text="批量加密", command=lambda: start(False))
+    encrypt_button.pack(side=tk.LEFT)
+    decrypt_button = tk.Button(buttons, text="批量解密", command=lambda: start(True))
+    decrypt_button.pack(side=tk.LEFT)
+    cancel_button = tk.Button(buttons, text="取消", command=cancel, state=tk.DISABLED)
+    cancel_button.pack(side=tk.LEFT)
+    tk.Button(buttons, text="清除文件", command=clear_file).pack(side=tk.LEFT)
+
+    def set_busy(busy):
+        idle_state, busy_state = (tk.DISABLED, tk.NORMAL) if busy else (tk.NORMAL, tk.DISABLED)
+        encrypt_button.config(state=idle_state)
+        decrypt_button.config(state=idle_state)
+        cancel_button.config(state=busy_state)
+
+    return frame
+
+
+# S-AES1.py：16位二进制密文解密器
+def run_decryptor():
+    import tkinter as tk
+    from tkinter import messagebox
+
+    def decrypt_clicked():
+        # 解密按钮的回调函数
+        try:
+            # 获取用户输入的密文和密钥
+            ciphertext = int(ciphertext_entry.get(), 2)
+            key = int(key_entry.get(), 2)
+        except ValueError:
+            # 显示错误信息
+            messagebox.showerror("Error", "Both ciphertext and key must be 16-bit binary strings")
+            return
+
+        # 解密密文
+        plaintext = s_aes_decrypt(ciphertext, key)
+        # 显示解密后的明文
+        plaintext_label.config(text="Plaintext: " + format(plaintext, '016b'))
+
+    # 设置主应用窗口
+    root = tk.Tk()
+    root.title("S-AES 解密器")
+
+    # 创建和放置控件
+    tk.Label(root, text="密文 (16-bit):").pack()
+    ciphertext_entry = tk.Entry(root)
+    ciphertext_entry.pack()
+
+    tk.Label(root, text="密钥 (16-bit):").pack()
+    key_entry = tk.Entry(root)
+    key_entry.pack()
+
+    decrypt_button = tk.Button(root, text="解密", command=decrypt_clicked)
+    decrypt_button.pack()
+
+    plaintext_label = tk.Label(root, text="明文:")
+    plaintext_label.pack()
+
+    # 启动GUI循环
+    root.mainloop()
+
+
+# S-AES2.py：16位二进制明文/密文的加解密界面
+def run_binary_gui():
+    import tkinter as tk
+    from tkinter import messagebox
+
+    def encrypt_clicked():
+        try:
+            plaintext = int(plaintext_entry.get(), 2)  # 将二进制字符串转换为整数
+            key = int(key_entry.get(), 2)  # 将二进制字符串转换为整数
+        except ValueError:
+            messagebox.showerror("Error", "Plaintext and key must be 16-bit binary strings")
+            return
+
+        ciphertext = s_aes_encrypt(plaintext, key)
+        ciphertext_label.config(text="Ciphertext: " + format(ciphertext, '016b'))  # 显示16位的二进制密文
+
+    def decrypt_clicked():
+        try:
+            ciphertext = int(ciphertext_entry.get(), 2)  # 将二进制字符串转换为整数
+            key = int(key_entry.get(), 2)  # 将二进制字符串转换为整数
+        except ValueError:
+            messagebox.showerror("Error", "Ciphertext and key must be 16-bit binary strings")
+            return
+
+        plaintext = s_aes_decrypt(ciphertext, key)
+        plaintext_label.config(text="Plaintext: " + format(plaintext, '016b'))  # 显示16位的二进制明文
+
+    root = tk.Tk()
+    root.title("S-AES Encryptor/Decryptor")
+
+    tk.Label(root, text="明文 (16-bit):").pack()
+    plaintext_entry = tk.Entry(root)
+    plaintext_entry.pack()
+
+    tk.Label(root, text="密文 (16-bit):").pack()
+    ciphertext_entry = tk.Entry(root)
+    ciphertext_entry.pack()
+
+    tk.Label(root, text="密钥 (16-bit):").pack()
+    key_entry = tk.Entry(root)
+    key_entry.pack()
+
+    encrypt_button = tk.Button(root, text="加密", command=encrypt_clicked)
+    encrypt_button.pack()
+
+    decrypt_button = tk.Button(root, text="解密", command=decrypt_clicked)
+    decrypt_button.pack()
+
+    ciphertext_label = tk.Label(root, text="密文:")
+    ciphertext_label.pack()
+
+    plaintext_label = tk.Label(root, text="明文:")
+    plaintext_label.pack()
+
+    _bulk_panel(root, tk, lambda: int(key_entry.get(), 2), 'basic').pack(fill=tk.X)
+
+    root.mainloop()
+
+
+# S-AES3.py：2个ASCII字符的加解密界面
+def run_text_gui():
+    import tkinter as tk
+    from tkinter import messagebox
+
+    # 加密按钮事件处理函数
+    def on_encrypt():
+        try:
+            key = int(entry_key.get(), 2)
+            plaintext = entry_plaintext.get()
+
+            if len(plaintext) != 2:
+                raise ValueError("Plaintext must be exactly 2 characters!")
+
+            plaintext_nibbles = str_to_nibbles(plaintext)
+            ciphertext_nibbles = encrypt(plaintext_nibbles, key)
+            ciphertext = nibbles_to_str(ciphertext_nibbles)
+
+            entry_ciphertext.delete(0, tk.END)
+            entry_ciphertext.insert(tk.END, ciphertext)
+
+        except ValueError as e:
+            messagebox.showerror("Error", f"Invalid input: {e}")
+
+    # 解密按钮事件处理函数
+    def on_decrypt():
+        try:
+            key = int(entry_key.get(), 2)
+            ciphertext = entry_ciphertext.get()
+
+            if len(ciphertext) != 2:
+                raise ValueError("Ciphertext must be exactly 2 characters!")
+
+            ciphertext_nibbles = str_to_nibbles(ciphertext)
+            decrypted_nibbles = decrypt(ciphertext_nibbles, key)
+            decrypted_text = nibbles_to_str(decrypted_nibbles)
+
+            entry_decrypted.delete(0, tk.END)
+            entry_decrypted.insert(tk.END, decrypted_text)
+
+        except ValueError as e:
+            messagebox.showerror("Error", f"Invalid input: {e}")
+
+    # 初始化主窗口
+    root = tk.Tk()
+    root.title("S-AES Encryption")
+
+    # 创建并放置组件
+    tk.Label(root, text="Key :").grid(row=0, column=0, sticky=tk.W)
+    entry_key = tk.Entry(root)
+    entry_key.grid(row=0, column=1, columnspan=2, sticky=tk.EW)
+
+    tk.Label(root, text="Plaintext (2 chars):").grid(row=1, column=0, sticky=tk.W)
+    entry_plaintext = tk.Entry(root)
+    entry_plaintext.grid(row=1, column=1, columnspan=2, sticky=tk.EW)
+
+    btn_encrypt = tk.Button(root, text="Encrypt", command=on_encrypt)
+    btn_encrypt.grid(row=2, column=1, sticky=tk.EW)
+
+    tk.Label(root, text="Ciphertext (2 chars):").grid(row=3, column=0, sticky=tk.W)
+    entry_ciphertext = tk.Entry(root)
+    entry_ciphertext.grid(row=3, column=1, columnspan=2, sticky=tk.EW)
+
+    btn_decrypt = tk.Button(root, text="Decrypt", command=on_decrypt)
+    btn_decrypt.grid(row=4, column=1, sticky=tk.EW)
+
+    tk.Label(root, text="Decrypted:").grid(row=5, column=0, sticky=tk.W)
+    entry_decrypted = tk.Entry(root)
+    entry_decrypted.grid(row=5, column=1, columnspan=2, sticky=tk.EW)
+
+    _bulk_panel(root, tk, lambda: int(entry_key.get(), 2), 'mixcol').grid(row=6, column=0, columnspan=3, sticky=tk.EW)
+    # 启动主循环
+    root.mainloop()
@@ -0,0 +1,74 @@
+# 密钥扩展结果缓存（LRU淘汰），供各个S-AES变体共用；可在多个线程中同时使用
+import threading
+from collections import OrderedDict
+
+
+class KeyScheduleCache:
+    """Memoize a key expansion function with bounded LRU eviction."""
+
+    def __init__(self, expand, maxsize=256):
+        self.expand = expand
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._schedules = OrderedDict()
+        self._lock = threading.Lock()
+
+    # 取出密钥对应的轮密钥，未命中时扩展并缓存（扩展在锁外进行）
+    def get(self, key):
+        """Return the (cached) round keys for `key`."""
+        schedules = self._schedules
+        with self._lock:
+            round_keys = schedules.get(key)
+            if round_keys is not None:
+                self.hits += 1
+                schedules.move_to_end(key)
+                return round_keys
+            self.misses += 1
+        round_keys = self.expand(key)
+        if not isinstance(round_keys, (tuple, bytes)):  # 列表等可变结果转成元组再缓存
+            round_keys = tuple(round_keys)
+        with self._lock:
+            if self.maxsize > 0:
+                schedules[key] = round_keys
+                while len(schedules) > self.maxsize:
+                    schedules.popitem(last=False)  # 淘汰最久未使用的密钥
+        return round_keys
+
+    # 预先扩展一个或多个密钥，后续加解密直接命中缓存
+    def preexpand(self, *keys):
+        """Expand `keys` ahead of time; returns the round keys of the last one."""
+        round_keys = None
+        for key in keys:
+            round_keys = self.get(key)
+        return round_keys
+
+    # 修改缓存容量，超出部分立即淘汰
+    def resize(self, maxsize):
+        """Change the size limit, evicting the least recently used entries."""
+        with self._lock:
+            self.maxsize = maxsize
+            while len(self._schedules) > max(maxsize, 0):
+                self._schedules.popitem(last=False)
+
+    def clear(self):
+        """Drop all cached schedules and reset the counters."""
+        with self._lock:
+            self._schedules.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """Return hit/miss counters and the current size as a dict."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._schedules),
+            "maxsize": self.maxsize,
+        }
+
+    def __len__(self):
+        return len(self._schedules)
+
+    def __contains__(self, key):
+        return key in self._schedules
@@ -0,0 +1,110 @@
+# 基于8位状态S-AES（saes.narrow，S-AES5.py使用的分组密码）的CMAC消息认证码
+# 接口与hashlib相同：update()可分多次输入，copy()复制中间状态，digest()/hexdigest()取结果。
+# 分组只有8位，标签也只有8位（随机伪造成功率1/256），仅用于教学和检测篡改。
+import hmac
+
+from .modes import byte_tables, cbc_encrypt_stream, cbc_decrypt_stream, STREAM_CHUNK_SIZE
+
+__all__ = ['CMAC', 'new', 'encrypt_then_mac_stream', 'decrypt_and_verify_stream']
+
+
+# CMAC子密钥：在GF(2^8)（模x^8+x^4+x^3+x+1）中乘x
+def _double(block):
+    block <<= 1
+    return (block ^ 0x1B) & 0xFF if block & 0x100 else block
+
+
+class CMAC:
+    """Incremental CMAC with a hashlib-style interface (8-bit block and tag)."""
+
+    name = 'saes-cmac'
+    digest_size = 1
+    block_size = 1
+
+    def __init__(self, key, data=b''):
+        self._table = byte_tables(key)[0]
+        self._k1 = _double(self._table[0])
+        self._k2 = _double(self._k1)
+        self._state = 0
+        self._last = None  # 最后一个分组要与子密钥异或，先不处理
+        if data:
+            self.update(data)
+
+    def update(self, data):
+        data = bytes(data)
+        if not data:
+            return
+        table, state = self._table, self._state
+        if self._last is not None:
+            state = table[state ^ self._last]
+        for block in data[:-1]:
+            state = table[state ^ block]
+        self._state, self._last = state, data[-1]
+
+    def copy(self):
+        other = CMAC.__new__(CMAC)
+        other.__dict__.update(self.__dict__)
+        return other
+
+    def digest(self):
+        if self._last is None:  # 空消息：填充一个分组 0x80，与K2异或
+            return bytes([self._table[self._state ^ 0x80 ^ self._k2]])
+        return bytes([self._table[self._state ^ self._last ^ self._k1]])
+
+    def hexdigest(self):
+        return self.digest().hex()
+
+    def verify(self, tag):
+        """Compare `tag` with the digest in constant time."""
+        return hmac.compare_digest(self.digest(), bytes(tag))
+
+def new(key, data=b''):
+    """Return a new `CMAC` object, like `hashlib.new`."""
+    return CMAC(key, data)
+
+
+# 写出数据的同时计算MAC
+class _MacWriter:
+    def __init__(self, writer, mac):
+        self.writer, self.mac = writer, mac
+
+    def write(self, data):
+        self.mac.update(data)
+        return self.writer.write(data)
+
+class _MacReader:
+    def __init__(self, reader, mac):
+        self.reader, self.mac = reader, mac
+
+    def read(self, size):
+        data = self.reader.read(size)
+        self.mac.update(data)
+        return data
+
+
+# 先加密后认证（一遍完成）：CBC加密写出密文，同时对IV和密文计算CMAC
+def encrypt_then_mac_stream(reader, writer, key, mac_key, iv, chunk_size=STREAM_CHUNK_SIZE):
+    """CBC-encrypt `reader` into `writer` and return the CMAC tag of IV + ciphertext.
+
+    Use a `mac_key` different from `key`. The input is read only once.
+    """
+    mac = CMAC(mac_key, bytes([iv & 0xFF]))
+    cbc_encrypt_stream(reader, _MacWriter(writer, mac), key, iv, chunk_size)
+    return mac.digest()
+
+# 一遍完成解密与验证；标签不符时抛出ValueError，此时已写出的明文必须丢弃
+def decrypt_and_verify_stream(reader, writer, key, mac_key, iv, tag, chunk_size=STREAM_CHUNK_SIZE):
+    """CBC-decrypt `reader` into `writer` while checking the tag from `encrypt_then_mac_stream`.
+
+    Raises ValueError after decryption if the tag does not match; whatever
+    was written must then be discarded.
+    """
+    mac = CMAC(mac_key, bytes([iv & 0xFF]))
+    if hasattr(reader, 'read'):
+        written = cbc_decrypt_stream(_MacReader(reader, mac), writer, key, iv, chunk_size)
+    else:
+        mac.update(reader)
+        written = cbc_decrypt_stream(reader, writer, key, iv, chunk_size)
+    if not mac.verify(tag):
+        raise ValueError("MAC check failed: ciphertext or IV was modified")
+    return written
@@ -0,0 +1,392 @@
+# 带列混淆的S-AES：状态为4个nibble的列表，对应S-AES3.py
+try:
+    import numpy as np
+except ImportError:  # 批量接口需要NumPy，单分组接口不受影响
+    np = None
+
+from .common import S_BOX, INV_S_BOX, RCON1, RCON2, mult, GF_MUL
+from .key_cache import KeyScheduleCache
+
+__all__ = [
+    'add_key', 'sub_nibbles', 'shift_rows', 'mix_columns', 'inv_mix_columns', 'key_expansion',
+    'key_cache', 'expand_key', 'encrypt', 'decrypt', 'encrypt_with_round_keys', 'decrypt_with_round_keys',
+    'str_to_nibbles', 'nibbles_to_str', 'nibbles_to_block', 'block_to_nibbles',
+    'table_key_cache', 'table_round_keys', 'encrypt_block', 'decrypt_block',
+    'encrypt_block_with_round_keys', 'decrypt_block_with_round_keys',
+    'encrypt_many', 'decrypt_many', 'full_key_schedule', 'all_key_schedule', 'encrypt_all_keys', 'decrypt_all_keys',
+    'encrypt_under_keys', 'decrypt_under_keys', 'BLOCK_SIZE', 'pad_bytes', 'unpad_bytes',
+    'encrypt_into', 'decrypt_into', 'encrypt_bytes', 'decrypt_bytes', 'TEXT_ENCODING', 'encrypt_text', 'decrypt_text',
+]
+
+
+# 在S-AES中进行轮密钥加操作（异或操作）
+def add_key(s1, s2):
+    """Add two keys in S-AES (xor operation)."""
+    return [i ^ j for i, j in zip(s1, [(s2 >> 4 * (1 - i % 2)) & 0xF for i in range(4)])]
+
+# 使用给定的S盒替换nibbles
+def sub_nibbles(sbox, s):
+    """Substitute nibbles using the given S-Box."""
+    return [sbox[i] for i in s]
+# 行移位操作
+
+def shift_rows(s):
+    """Shift rows operation."""
+    return [s[0], s[1], s[3], s[2]]
+# S-AES的列混淆操作
+def mix_columns(s):
+    """Mix columns operation for S-AES."""
+    return [
+        s[0] ^ mult(4, s[2]), s[1] ^ mult(4, s[3]),
+        s[2] ^ mult(4, s[0]), s[3] ^ mult(4, s[1])
+    ]
+
+# S-AES的逆列混淆操作（矩阵[[9, 2], [2, 9]]）
+def inv_mix_columns(s):
+    """Inverse mix columns operation for S-AES."""
+    return [
+        mult(9, s[0]) ^ mult(2, s[2]), mult(9, s[1]) ^ mult(2, s[3]),
+        mult(9, s[2]) ^ mult(2, s[0]), mult(9, s[3]) ^ mult(2, s[1])
+    ]
+
+# S-AES的密钥扩展操作
+def key_expansion(key):
+    """Key expansion for S-AES."""
+    w = [0] * 6
+    w[0] = (key >> 8) & 0xFF
+    w[1] = key & 0xFF
+    w[2] = w[0] ^ RCON1 ^ (S_BOX[w[1] >> 4] << 4 | S_BOX[w[1] & 0xF])
+    w[3] = w[2] ^ w[1]
+    w[4] = w[2] ^ RCON2 ^ (S_BOX[w[3] >> 4] << 4 | S_BOX[w[3] & 0xF])
+    w[5] = w[4] ^ w[3]
+    return [w[0] << 8 | w[1], w[2] << 8 | w[3], w[4] << 8 | w[5]]
+
+# 密钥扩展缓存，同一密钥只扩展一次
+key_cache = KeyScheduleCache(key_expansion)
+
+def expand_key(key):
+    """Return the cached key schedule for `key` (also used to pre-expand keys)."""
+    return key_cache.get(key)
+
+# S-AES加密函数
+def encrypt(plaintext, key):
+    """Encrypts a block of plaintext with S-AES."""
+    return encrypt_with_round_keys(plaintext, expand_key(key))
+
+def encrypt_with_round_keys(plaintext, key_schedule):
+    """Encrypts a block of plaintext with an already expanded key schedule."""
+    state = add_key(plaintext, key_schedule[0])
+
+    state = sub_nibbles(S_BOX, state)
+    state = shift_rows(state)
+    state = mix_columns(state)
+    state = add_key(state, key_schedule[1])
+
+    state = sub_nibbles(S_BOX, state)
+    state = shift_rows(state)
+    state = add_key(state, key_schedule[2])
+
+    return state
+
+# S-AES解密函数
+def decrypt(ciphertext, key):
+    """Decrypts a block of ciphertext with S-AES."""
+    return decrypt_with_round_keys(ciphertext, expand_key(key))
+
+def decrypt_with_round_keys(ciphertext, key_schedule):
+    """Decrypts a block of ciphertext with an already expanded key schedule."""
+    state = add_key(ciphertext, key_schedule[2])
+    state = shift_rows(state)
+    state = sub_nibbles(INV_S_BOX, state)
+
+    state = add_key(state, key_schedule[1])
+    state = inv_mix_columns(state)
+    state = shift_rows(state)
+    state = sub_nibbles(INV_S_BOX, state)
+
+    state = add_key(state, key_schedule[0])
+
+    return state
+
+# 将字符串转换为nibbles列表
+def str_to_nibbles(s):
+    """Convert a string to a list of nibbles."""
+    return [(ord(s[i // 2]) >> (4 * (1 - i % 2))) & 0xF for i in range(len(s) * 2)]
+# 将nibbles列表转换回字符串
+def nibbles_to_str(nibbles):
+    """Convert a list of nibbles back to a string."""
+    result = []
+    for i in range(0, len(nibbles), 2):
+        result.append(chr((nibbles[i] << 4) | nibbles[i + 1]))
+    return ''.join(result)
+
+# 4个nibble的列表与16位整数分组之间的转换（批量接口使用整数分组）
+def nibbles_to_block(nibbles):
+    """Pack a list of 4 nibbles into a 16-bit block."""
+    return (nibbles[0] << 12) | (nibbles[1] << 8) | (nibbles[2] << 4) | nibbles[3]
+
+def block_to_nibbles(block):
+    """Unpack a 16-bit block into a list of 4 nibbles."""
+    return [(block >> 12) & 0xF, (block >> 8) & 0xF, (block >> 4) & 0xF, block & 0xF]
+
+
+# add_key只使用轮密钥的低8位，并把它重复到两个字节上
+def _key_word(round_key):
+    return (round_key & 0xFF) * 0x0101
+
+# T表实现：状态是一个16位整数，SubNibbles+ShiftRows+MixColumns合并成按字节索引的两张表，
+# 每轮只需两次查表和异或，不构造中间列表。高字节是nibble 0、1，低字节是nibble 2、3。
+def _t_tables():
+    s, m4 = S_BOX, GF_MUL[4]
+    inv, m2, m9 = INV_S_BOX, GF_MUL[2], GF_MUL[9]
+    enc_hi, enc_lo, last_hi, last_lo, dec_hi, dec_lo, inv_sub = ([0] * 256 for _ in range(7))
+    for b in range(256):
+        x, y = b >> 4, b & 0xF
+        # 加密：shift_rows交换nibble 2、3，mix_columns把每个nibble异或到同列另一个nibble的乘4上
+        enc_hi[b] = s[x] << 12 | s[y] << 8 | m4[s[x]] << 4 | m4[s[y]]
+        enc_lo[b] = m4[s[y]] << 12 | m4[s[x]] << 8 | s[y] << 4 | s[x]
+        last_hi[b] = s[x] << 12 | s[y] << 8
+        last_lo[b] = s[y] << 4 | s[x]
+        # 解密：shift_rows、逆S盒、逆列混淆、shift_rows合并（轮密钥另行做逆列混淆）
+        dec_hi[b] = m9[inv[x]] << 12 | m9[inv[y]] << 8 | m2[inv[y]] << 4 | m2[inv[x]]
+        dec_lo[b] = m2[inv[y]] << 12 | m2[inv[x]] << 8 | m9[inv[x]] << 4 | m9[inv[y]]
+        inv_sub[b] = inv[x] << 4 | inv[y]
+    return enc_hi, enc_lo, last_hi, last_lo, dec_hi, dec_lo, inv_sub
+
+_ENC_HI, _ENC_LO, _LAST_HI, _LAST_LO, _DEC_HI, _DEC_LO, _INV_SUB = _t_tables()
+
+# T表使用的整数轮密钥：(k0, k1, k2, 解密第二轮使用的k1)
+def table_round_keys(key):
+    """Integer round keys for the T-table functions."""
+    k0, k1, k2 = (_key_word(k) for k in expand_key(key))
+    mixed = nibbles_to_block(shift_rows(inv_mix_columns(block_to_nibbles(k1))))
+    return k0, k1, k2, mixed
+
+table_key_cache = KeyScheduleCache(table_round_keys)
+
+def encrypt_block_with_round_keys(block, table_keys):
+    """Encrypt a 16-bit block with keys from `table_round_keys`."""
+    s = block ^ table_keys[0]
+    s = _ENC_HI[s >> 8] ^ _ENC_LO[s & 0xFF] ^ table_keys[1]
+    return _LAST_HI[s >> 8] ^ _LAST_LO[s & 0xFF] ^ table_keys[2]
+
+def decrypt_block_with_round_keys(block, table_keys):
+    """Decrypt a 16-bit block with keys from `table_round_keys`."""
+    s = block ^ table_keys[2]
+    s = _DEC_HI[s >> 8] ^ _DEC_LO[s & 0xFF] ^ table_keys[3]
+    return (_INV_SUB[s >> 8] << 8 | _INV_SUB[s & 0xFF]) ^ table_keys[0]
+
+# 整数分组的单分组加解密，结果与encrypt/decrypt一致（分组打包方式同nibbles_to_block）
+def encrypt_block(block, key):
+    """Encrypt one 16-bit block using the T-table round implementation."""
+    return encrypt_block_with_round_keys(block, table_key_cache.get(key))
+
+def decrypt_block(block, key):
+    """Decrypt one 16-bit block using the T-table round implementation."""
+    return decrypt_block_with_round_keys(block, table_key_cache.get(key))
+
+
+# 批量加解密使用的查找表：对一个字节的两个nibble同时查表
+def _byte_table(nibble_table):
+    return np.array([nibble_table[b >> 4] << 4 | nibble_table[b & 0xF] for b in range(256)], dtype=np.uint16)
+
+if np is not None:
+    _SUB_BYTES = _byte_table(S_BOX)
+    _INV_SUB_BYTES = _byte_table(INV_S_BOX)
+    _MUL4_BYTES = _byte_table([mult(4, i) for i in range(16)])
+    _MUL2_BYTES = _byte_table([mult(2, i) for i in range(16)])
+    _MUL9_BYTES = _byte_table([mult(9, i) for i in range(16)])
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("encrypt_many/decrypt_many require NumPy")
+
+def _sub_nibbles_many(byte_table, s):
+    return (byte_table[s >> 8] << 8) | byte_table[s & 0xFF]
+
+def _shift_rows_many(s):
+    return (s & 0xFF00) | ((s & 0x000F) << 4) | ((s >> 4) & 0x000F)
+
+# 列混淆：每个nibble异或上同列另一个nibble乘4的结果，即 s ^ mult4(s循环移8位)
+def _mix_columns_many(s):
+    rotated = (s >> 8) | (s << 8)
+    return s ^ _sub_nibbles_many(_MUL4_BYTES, rotated)
+
+def _inv_mix_columns_many(s):
+    rotated = (s >> 8) | (s << 8)
+    return _sub_nibbles_many(_MUL9_BYTES, s) ^ _sub_nibbles_many(_MUL2_BYTES, rotated)
+
+# 批量加解密的轮函数；轮密钥k0/k1/k2可以是标量，也可以是与状态等长的数组（每个分组一个密钥）
+# mix=False时跳过列混淆，即无列混淆的saes.basic（saes.brute_force的'saes2'变体）
+def _encrypt_state(state, k0, k1, k2, mix=True):
+    state = state ^ k0
+
+    state = _sub_nibbles_many(_SUB_BYTES, state)
+    state = _shift_rows_many(state)
+    if mix:
+        state = _mix_columns_many(state)
+    state ^= k1
+
+    state = _sub_nibbles_many(_SUB_BYTES, state)
+    state = _shift_rows_many(state)
+    state ^= k2
+
+    return state
+
+def _decrypt_state(state, k0, k1, k2, mix=True):
+    state = state ^ k2
+    state = _shift_rows_many(state)
+    state = _sub_nibbles_many(_INV_SUB_BYTES, state)
+
+    state ^= k1
+    if mix:
+        state = _inv_mix_columns_many(state)
+    state = _shift_rows_many(state)
+    state = _sub_nibbles_many(_INV_SUB_BYTES, state)
+
+    state ^= k0
+
+    return state
+
+# 批量S-AES加密
+def encrypt_many(blocks, key):
+    """Encrypt an array of 16-bit blocks with S-AES, returning a uint16 array.
+
+    Each block packs the 4 nibbles used by `encrypt` (first nibble in the high
+    bits); the result matches `encrypt` block for block.
+    """
+    _require_numpy()
+    key_schedule = [np.uint16(_key_word(k)) for k in expand_key(key)]
+    return _encrypt_state(np.asarray(blocks, dtype=np.uint16), *key_schedule)
+
+# 批量S-AES解密
+def decrypt_many(blocks, key):
+    """Decrypt an array of 16-bit blocks with S-AES, returning a uint16 array.
+
+    The result matches `decrypt` block for block.
+    """
+    _require_numpy()
+    key_schedule = [np.uint16(_key_word(k)) for k in expand_key(key)]
+    return _decrypt_state(np.asarray(blocks, dtype=np.uint16), *key_schedule)
+
+_full_key_schedule = None
+_all_keys_schedule = None
+
+# 全部65536个密钥的完整16位轮密钥 (w0w1, w2w3, w4w5)，只计算一次
+def full_key_schedule():
+    """Full 16-bit round keys of all 65536 keys as three uint16 arrays (computed once)."""
+    global _full_key_schedule
+    _require_numpy()
+    if _full_key_schedule is None:
+        keys = np.arange(0x10000, dtype=np.uint16)
+        w0, w1 = keys >> 8, keys & 0xFF
+        w2 = w0 ^ RCON1 ^ _SUB_BYTES[w1]
+        w3 = w2 ^ w1
+        w4 = w2 ^ RCON2 ^ _SUB_BYTES[w3]
+        w5 = w4 ^ w3
+        _full_key_schedule = (keys, (w2 << 8) | w3, (w4 << 8) | w5)
+    return _full_key_schedule
+
+# 全部65536个密钥的轮密钥（add_key使用的形式：只用低字节），只计算一次
+def all_key_schedule():
+    """Round keys of all 65536 keys as three uint16 arrays (computed once)."""
+    global _all_keys_schedule
+    if _all_keys_schedule is None:
+        _all_keys_schedule = tuple((k & 0xFF) * np.uint16(0x0101) for k in full_key_schedule())
+    return _all_keys_schedule
+
+# 同一个分组在全部密钥下加解密：result[K] 与 nibbles_to_block(encrypt(block_to_nibbles(block), K)) 相同
+def encrypt_all_keys(block):
+    """Encrypt one 16-bit block under every key, returning 65536 uint16 results."""
+    _require_numpy()
+    return encrypt_under_keys(block, np.arange(0x10000))
+
+def decrypt_all_keys(block):
+    """Decrypt one 16-bit block under every key, returning 65536 uint16 results."""
+    _require_numpy()
+    return decrypt_under_keys(block, np.arange(0x10000))
+
+# 分组在一组密钥下加解密，blocks与keys按NumPy广播规则对应（如一个分组对多个密钥）
+def encrypt_under_keys(blocks, keys):
+    """Encrypt `blocks` under the matching entries of `keys` (NumPy broadcasting)."""
+    _require_numpy()
+    blocks, keys = np.broadcast_arrays(np.asarray(blocks, dtype=np.uint16), np.asarray(keys, dtype=np.intp))
+    return _encrypt_state(blocks, *[k[keys] for k in all_key_schedule()])
+
+def decrypt_under_keys(blocks, keys):
+    """Decrypt `blocks` under the matching entries of `keys` (NumPy broadcasting)."""
+    _require_numpy()
+    blocks, keys = np.broadcast_arrays(np.asarray(blocks, dtype=np.uint16), np.asarray(keys, dtype=np.intp))
+    return _decrypt_state(blocks, *[k[keys] for k in all_key_schedule()])
+
+# 字节接口：2字节为一个分组（第一个字节在高位），直接在缓冲区上加解密
+BLOCK_SIZE = 2
+
+def pad_bytes(data):
+    """Return `data` padded to a whole number of blocks (PKCS#7 style)."""
+    padding = BLOCK_SIZE - len(data) % BLOCK_SIZE
+    return bytes(data) + bytes([padding]) * padding
+
+def unpad_bytes(data):
+    """Strip the padding added by `pad_bytes`."""
+    padding = data[-1] if len(data) else 0
+    if not 1 <= padding <= BLOCK_SIZE or len(data) % BLOCK_SIZE or bytes(data[-padding:]) != bytes([padding]) * padding:
+        raise ValueError("Invalid padding")
+    return bytes(data[:-padding])
+
+# 对块对齐的缓冲区逐分组处理；有NumPy时整体向量化，否则退回T表单分组函数
+def _crypt_into(data, key, out, many, single):
+    view = memoryview(data).cast('B')
+    if len(view) % BLOCK_SIZE:
+        raise ValueError(f"Data length must be a multiple of {BLOCK_SIZE} bytes")
+    out_view = memoryview(view if out is None else out).cast('B')
+    if out_view.readonly or len(out_view) < len(view):
+        raise ValueError("Output buffer must be writable and at least as long as the data")
+    if np is not None:
+        blocks = np.frombuffer(view, dtype='>u2')
+        np.frombuffer(out_view, dtype='>u2', count=len(blocks))[:] = many(blocks, key)
+    else:
+        table_keys = table_key_cache.get(key)
+        for i in range(0, len(view), BLOCK_SIZE):
+            block = single(view[i] << 8 | view[i + 1], table_keys)
+            out_view[i] = block >> 8
+            out_view[i + 1] = block & 0xFF
+    return out_view
+
+def encrypt_into(data, key, out=None):
+    """Encrypt block-aligned bytes-like `data` into `out`, or in place if `out` is None.
+
+    Returns a memoryview of the written bytes.
+    """
+    return _crypt_into(data, key, out, encrypt_many, encrypt_block_with_round_keys)
+
+def decrypt_into(data, key, out=None):
+    """Decrypt block-aligned bytes-like `data` into `out`, or in place if `out` is None.
+
+    Returns a memoryview of the written bytes.
+    """
+    return _crypt_into(data, key, out, decrypt_many, decrypt_block_with_round_keys)
+
+def encrypt_bytes(data, key):
+    """Pad and encrypt a bytes-like message of any length."""
+    buffer = bytearray(pad_bytes(data))
+    encrypt_into(buffer, key)
+    return bytes(buffer)
+
+def decrypt_bytes(data, key):
+    """Decrypt a message produced by `encrypt_bytes` and strip its padding."""
+    buffer = bytearray(data)
+    decrypt_into(buffer, key)
+    return unpad_bytes(buffer)
+
+# 文本模式：每个字符对应一个字节（与str_to_nibbles/nibbles_to_str相同，使用latin-1）
+# 图形界面等处在文本与字节之间转换时也使用这个编码
+TEXT_ENCODING = 'latin-1'
+
+def encrypt_text(text, key):
+    """Encrypt a string of any length, returning the ciphertext as a string."""
+    return encrypt_bytes(text.encode(TEXT_ENCODING), key).decode(TEXT_ENCODING)
+
+def decrypt_text(text, key):
+    """Decrypt a string produced by `encrypt_text`."""
+    return decrypt_bytes(text.encode(TEXT_ENCODING), key).decode(TEXT_ENCODING)
@@ -0,0 +1,254 @@
+# 基于8位状态S-AES的CBC/CTR/OFB/CFB工作模式与流式加解密，对应S-AES5.py
+import atexit
+import os
+import random
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from .key_cache import KeyScheduleCache
+from .narrow import expand_key, encrypt_with_round_keys, decrypt_with_round_keys
+
+__all__ = [
+    'generate_iv', 'cbc_encrypt', 'cbc_decrypt', 'PARALLEL_MIN_BLOCKS', 'STREAM_CHUNK_SIZE',
+    'byte_tables', 'cbc_encrypt_stream', 'cbc_decrypt_stream', 'CTR_PARALLEL_MIN_BYTES', 'ctr_encrypt', 'ctr_decrypt',
+    'ofb_cache', 'ofb_keystream', 'ofb_prefetch', 'ofb_encrypt', 'ofb_decrypt', 'cfb_encrypt', 'cfb_decrypt',
+    'tamper_ciphertext',
+]
+
+# CBC模式加解密
+def generate_iv():
+    # 生成随机16位初始向量
+    return random.randint(0, 0xFFFF)
+
+def cbc_encrypt(plaintext, key, iv):
+    ciphertext = []
+    previous_block = iv
+    round_keys = expand_key(key)  # 整条消息只扩展一次密钥
+    for i in range(0, len(plaintext), 2):  # 每次处理2字节
+        block = plaintext[i:i + 2]
+        block = block[0] << 4 | block[1] if len(block) == 2 else block[0]
+        block = block ^ previous_block  # XOR with previous ciphertext (or IV for first block)
+        encrypted_block = encrypt_with_round_keys(block, round_keys)  # 使用S-AES加密
+        ciphertext.append(encrypted_block)
+        previous_block = encrypted_block  # 更新previous_block
+    return ciphertext
+
+def cbc_decrypt(ciphertext, key, iv, workers=1):
+    if workers > 1 and len(ciphertext) >= 2 * PARALLEL_MIN_BLOCKS:
+        return _cbc_decrypt_parallel(ciphertext, key, iv, workers)
+    plaintext = []
+    previous_block = iv
+    round_keys = expand_key(key)  # 整条消息只扩展一次密钥
+    for block in ciphertext:
+        decrypted_block = decrypt_with_round_keys(block, round_keys)  # 使用S-AES解密
+        decrypted_block ^= previous_block  # XOR with previous ciphertext (or IV for first block)
+        plaintext.append(decrypted_block >> 4)  # 提取高4位
+        plaintext.append(decrypted_block & 0xF)  # 提取低4位
+        previous_block = block  # 更新previous_block
+    return plaintext
+
+# 并行处理时每个分片至少包含的分组数，太短的消息直接顺序处理
+PARALLEL_MIN_BLOCKS = 4096
+
+# 把消息切成分片，分片交给进程池时返回每片的起始下标
+def _shard_bounds(length, workers, min_size=PARALLEL_MIN_BLOCKS):
+    shard_size = max(min_size, -(-length // workers))
+    return [(start, min(start + shard_size, length)) for start in range(0, length, shard_size)]
+
+# 分片共用一个进程池：第一次并行调用时按CPU数创建，之后不再替换，退出时关闭。
+# 每次调用最多切成workers片，所以同时运行的任务数仍由workers决定。
+_pool = None
+_pool_lock = threading.Lock()
+
+def _shared_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(os.cpu_count() or 1)
+            atexit.register(_pool.shutdown)
+        return _pool
+
+def _run_shards(func, tasks, workers):
+    return list(_shared_pool().map(func, tasks))
+
+def _cbc_decrypt_shard(task):
+    shard, key, iv = task
+    return cbc_decrypt(shard, key, iv)
+
+# CBC解密的每个分组只依赖密文，分片后每片以前一个密文分组作为自己的IV
+def _cbc_decrypt_parallel(ciphertext, key, iv, workers):
+    tasks = [(ciphertext[start:stop], key, ciphertext[start - 1] if start else iv)
+             for start, stop in _shard_bounds(len(ciphertext), workers)]
+    plaintext = []
+    for shard_plaintext in _run_shards(_cbc_decrypt_shard, tasks, workers):
+        plaintext.extend(shard_plaintext)
+    return plaintext
+
+# 流式CBC：每个分组是一个字节（两个nibble），与cbc_encrypt对nibble列表的处理一致
+# 字节流总是与分组对齐，因此不需要填充
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# 预先计算该密钥下256个分组的加密表和解密表
+def byte_tables(key):
+    round_keys = expand_key(key)
+    encrypt_table = bytes(encrypt_with_round_keys(b, round_keys) for b in range(256))
+    decrypt_table = bytes(decrypt_with_round_keys(b, round_keys) for b in range(256))
+    return encrypt_table, decrypt_table
+
+# 按固定大小分块读取文件对象（或mmap）；也接受bytes/memoryview
+def _read_chunks(reader, chunk_size):
+    if not hasattr(reader, 'read'):
+        view = memoryview(reader).cast('B')
+        for start in range(0, len(view), chunk_size):
+            yield bytes(view[start:start + chunk_size])
+        return
+    while True:
+        chunk = reader.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+def cbc_encrypt_stream(reader, writer, key, iv, chunk_size=STREAM_CHUNK_SIZE):
+    # 分块CBC加密，链值跨块传递，内存占用与输入大小无关；返回写出的字节数
+    encrypt_table = byte_tables(key)[0]
+    previous_block = iv & 0xFF
+    written = 0
+    for chunk in _read_chunks(reader, chunk_size):
+        out = bytearray(len(chunk))
+        for i, block in enumerate(chunk):
+            previous_block = encrypt_table[block ^ previous_block]
+            out[i] = previous_block
+        writer.write(out)
+        written += len(out)
+    return written
+
+def cbc_decrypt_stream(reader, writer, key, iv, chunk_size=STREAM_CHUNK_SIZE):
+    # 分块CBC解密：整块查表解密后与错开一个字节的密文异或；返回写出的字节数
+    decrypt_table = byte_tables(key)[1]
+    previous_block = iv & 0xFF
+    written = 0
+    for chunk in _read_chunks(reader, chunk_size):
+        chunk = bytes(chunk)
+        decrypted = chunk.translate(decrypt_table)
+        chained = bytes([previous_block]) + chunk[:-1]
+        plain = int.from_bytes(decrypted, 'big') ^ int.from_bytes(chained, 'big')
+        writer.write(plain.to_bytes(len(chunk), 'big'))
+        previous_block = chunk[-1]
+        written += len(chunk)
+    return written
+
+# CTR模式：第i个分组与 E(iv + i) 异或，各分组互不依赖，可并行也可从任意位置开始
+# 分组只有8位，因此密钥流每256个分组循环一次
+def _ctr_keystream(key, iv, start_block, length):
+    encrypt_table = byte_tables(key)[0]
+    period = bytes(encrypt_table[(iv + i) & 0xFF] for i in range(256))
+    offset = start_block % 256
+    period = period[offset:] + period[:offset]
+    return (period * (length // 256 + 1))[:length]
+
+# 顺序CTR每字节只需约10ns，与把分片发给子进程再取回的开销相当，只有很长的消息才分片
+CTR_PARALLEL_MIN_BYTES = 16 << 20
+
+def _ctr_shard(task):
+    data, key, iv, start_block = task
+    return ctr_encrypt(data, key, iv, start_block)
+
+def ctr_encrypt(data, key, iv, start_block=0, workers=1):
+    # data为bytes类字节序列，start_block是data第一个字节在整条消息中的分组序号
+    data = bytes(data)
+    if workers > 1 and len(data) >= 2 * CTR_PARALLEL_MIN_BYTES:
+        tasks = [(data[start:stop], key, iv, start_block + start)
+                 for start, stop in _shard_bounds(len(data), workers, CTR_PARALLEL_MIN_BYTES)]
+        return b''.join(_run_shards(_ctr_shard, tasks, workers))
+    keystream = _ctr_keystream(key, iv, start_block, len(data))
+    return (int.from_bytes(data, 'big') ^ int.from_bytes(keystream, 'big')).to_bytes(len(data), 'big')
+
+def ctr_decrypt(data, key, iv, start_block=0, workers=1):
+    # CTR解密与加密相同
+    return ctr_encrypt(data, key, iv, start_block, workers)
+
+# OFB模式：密钥流 O_i = E(O_{i-1})，O_{-1} = IV。分组只有8位，E是256个值上的置换，
+# 所以密钥流从第一个分组起就是周期序列（周期不超过256）。整个周期按(密钥, IV)缓存，
+# 之后同一(密钥, IV)下的消息只需异或。
+def _ofb_period(key_iv):
+    key, iv = key_iv
+    encrypt_table = byte_tables(key)[0]
+    start = block = encrypt_table[iv]
+    period = bytearray()
+    while True:
+        period.append(block)
+        block = encrypt_table[block]
+        if block == start:
+            return bytes(period)
+
+ofb_cache = KeyScheduleCache(_ofb_period, maxsize=64)
+# 后台正在生成的密钥流：(密钥, IV) -> Future；锁只保护这个字典和线程池的创建
+_ofb_pending = {}
+_ofb_lock = threading.Lock()
+_ofb_executor = None
+
+def ofb_keystream(key, iv):
+    """Return one full period of the OFB keystream for (key, iv) as bytes."""
+    key_iv = (key, iv & 0xFF)
+    with _ofb_lock:
+        future = _ofb_pending.get(key_iv)
+    if future is not None:  # 后台线程正在生成同一个(密钥, IV)，等它完成而不重复计算
+        return future.result()
+    return ofb_cache.get(key_iv)
+
+def _ofb_fill(key_iv):
+    try:
+        return ofb_cache.get(key_iv)
+    finally:
+        with _ofb_lock:
+            _ofb_pending.pop(key_iv, None)
+
+def ofb_prefetch(key, iv):
+    """Generate the OFB keystream for (key, iv) in a background thread; returns a Future."""
+    global _ofb_executor
+    key_iv = (key, iv & 0xFF)
+    with _ofb_lock:
+        future = _ofb_pending.get(key_iv)
+        if future is None:
+            if _ofb_executor is None:
+                _ofb_executor = ThreadPoolExecutor(1, thread_name_prefix='saes-ofb')
+            future = _ofb_pending[key_iv] = _ofb_executor.submit(_ofb_fill, key_iv)
+    return future
+
+def ofb_encrypt(data, key, iv, start_block=0):
+    # start_block是data第一个字节在整条消息中的分组序号，可从任意位置开始
+    data = bytes(data)
+    period = ofb_keystream(key, iv)
+    offset = start_block % len(period)
+    period = period[offset:] + period[:offset]
+    keystream = (period * (len(data) // len(period) + 1))[:len(data)]
+    return (int.from_bytes(data, 'big') ^ int.from_bytes(keystream, 'big')).to_bytes(len(data), 'big')
+
+def ofb_decrypt(data, key, iv, start_block=0):
+    # OFB解密与加密相同
+    return ofb_encrypt(data, key, iv, start_block)
+
+# CFB模式（8位反馈）：C_i = P_i ^ E(C_{i-1})，C_{-1} = IV
+# 加密必须逐字节进行；解密只依赖密文，可以整块查表后异或
+def cfb_encrypt(data, key, iv):
+    encrypt_table = byte_tables(key)[0]
+    previous_block = iv & 0xFF
+    out = bytearray(len(data))
+    for i, block in enumerate(bytes(data)):
+        previous_block = block ^ encrypt_table[previous_block]
+        out[i] = previous_block
+    return bytes(out)
+
+def cfb_decrypt(data, key, iv):
+    data = bytes(data)
+    if not data:
+        return b''
+    keystream = (bytes([iv & 0xFF]) + data[:-1]).translate(byte_tables(key)[0])
+    return (int.from_bytes(data, 'big') ^ int.from_bytes(keystream, 'big')).to_bytes(len(data), 'big')
+
+# 篡改密文
+def tamper_ciphertext(ciphertext):
+    # 简单的篡改第一个密文块
+    if len(ciphertext) > 0:
+        ciphertext[0] ^= 0xFFFF  # 将第一个密文块进行XOR修改
+    return ciphertext
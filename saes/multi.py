@@ -0,0 +1,231 @@
+# 基于8位状态S-AES的双重/三重加密与中间相遇攻击，对应S-AES4.py
+import os
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from . import narrow
+from .key_cache import KeyScheduleCache
+from .narrow import encrypt, decrypt, encrypt_with_round_keys, decrypt_with_round_keys, key_expansion
+
+__all__ = [
+    'double_encrypt', 'double_decrypt', 'triple_encrypt', 'triple_decrypt',
+    'COMPOSITE_SCHEMES', 'composite_cache', 'composite_codebook', 'composite_encrypt_bytes',
+    'composite_decrypt_bytes', 'meet_in_the_middle_attack', 'MITM_CHUNK_SIZE', 'multi_pair_meet_in_the_middle',
+]
+
+# 双重加密，use_codebook=True时直接查组合后的码本
+def double_encrypt(plaintext, key, use_codebook=False):
+    if use_codebook:
+        return composite_codebook(key, 'double')[0][plaintext & 0xFF]
+    K1 = (key >> 16) & 0xFFFF
+    K2 = key & 0xFFFF
+    intermediate = encrypt(plaintext, K1)
+    ciphertext = encrypt(intermediate, K2)
+    return ciphertext
+
+def double_decrypt(ciphertext, key, use_codebook=False):
+    if use_codebook:
+        return composite_codebook(key, 'double')[1][ciphertext & 0xFF]
+    K1 = (key >> 16) & 0xFFFF
+    K2 = key & 0xFFFF
+    intermediate = decrypt(ciphertext, K2)
+    plaintext = decrypt(intermediate, K1)
+    return plaintext
+
+# 三重加密，use_codebook=True时直接查组合后的码本
+def triple_encrypt(plaintext, key, mode=1, use_codebook=False):
+    if use_codebook:
+        return composite_codebook(key, f'triple{mode}')[0][plaintext & 0xFF]
+    if mode == 1:
+        K1 = (key >> 16) & 0xFFFF
+        K2 = key & 0xFFFF
+        intermediate1 = encrypt(plaintext, K1)
+        intermediate2 = decrypt(intermediate1, K2)
+        ciphertext = encrypt(intermediate2, K1)
+    elif mode == 2:
+        K1 = (key >> 32) & 0xFFFF
+        K2 = (key >> 16) & 0xFFFF
+        K3 = key & 0xFFFF
+        intermediate1 = encrypt(plaintext, K1)
+        intermediate2 = decrypt(intermediate1, K2)
+        ciphertext = encrypt(intermediate2, K3)
+    return ciphertext
+
+def triple_decrypt(ciphertext, key, mode=1, use_codebook=False):
+    if use_codebook:
+        return composite_codebook(key, f'triple{mode}')[1][ciphertext & 0xFF]
+    if mode == 1:
+        K1 = (key >> 16) & 0xFFFF
+        K2 = key & 0xFFFF
+        intermediate1 = decrypt(ciphertext, K1)
+        intermediate2 = encrypt(intermediate1, K2)
+        plaintext = decrypt(intermediate2, K1)
+    elif mode == 2:
+        K1 = (key >> 32) & 0xFFFF
+        K2 = (key >> 16) & 0xFFFF
+        K3 = key & 0xFFFF
+        intermediate1 = decrypt(ciphertext, K3)
+        intermediate2 = encrypt(intermediate1, K2)
+        plaintext = decrypt(intermediate2, K1)
+    return plaintext
+
+# 组合码本：加密只使用分组的低8位，因此多重加密整体也是256个取值上的一个置换，
+# 对固定的(方案, 密钥)预先算出正向表和逆向表，之后每个分组只需查一次表
+COMPOSITE_SCHEMES = {
+    'double': (double_encrypt, double_decrypt),
+    'triple1': (lambda p, k: triple_encrypt(p, k, mode=1), lambda c, k: triple_decrypt(c, k, mode=1)),
+    'triple2': (lambda p, k: triple_encrypt(p, k, mode=2), lambda c, k: triple_decrypt(c, k, mode=2)),
+}
+
+def _build_composite(scheme_key):
+    scheme, key = scheme_key
+    if scheme not in COMPOSITE_SCHEMES:
+        raise ValueError(f"Unknown scheme {scheme!r}, expected one of {list(COMPOSITE_SCHEMES)}")
+    encrypt_layers, decrypt_layers = COMPOSITE_SCHEMES[scheme]
+    forward = bytes(encrypt_layers(p, key) for p in range(256))
+    inverse = bytes(decrypt_layers(c, key) for c in range(256))
+    return forward, inverse
+
+# 最近使用的组合密钥的码本缓存
+composite_cache = KeyScheduleCache(_build_composite, maxsize=16)
+
+def composite_codebook(key, scheme='double'):
+    """Return the (forward, inverse) 256-entry tables for a 32/48-bit multi-layer key.
+
+    `scheme` is 'double', 'triple1' (K1-K2-K1) or 'triple2' (K1-K2-K3).
+    """
+    return composite_cache.get((scheme, key))
+
+# 批量多重加解密：每个字节是一个分组，整段数据一次查表
+def composite_encrypt_bytes(data, key, scheme='double'):
+    return bytes(data).translate(composite_codebook(key, scheme)[0])
+
+def composite_decrypt_bytes(data, key, scheme='double'):
+    return bytes(data).translate(composite_codebook(key, scheme)[1])
+
+# 中间相遇攻击
+def meet_in_the_middle_attack(known_plaintext, known_ciphertext):
+    if narrow.HAVE_NUMPY:
+        return _meet_in_the_middle_all_keys(known_plaintext, known_ciphertext)
+    # 每个候选密钥只用一次，直接扩展而不占用缓存
+    potential_keys = {}
+    for K1 in range(0x10000):
+        intermediate = encrypt_with_round_keys(known_plaintext, key_expansion(K1))
+        potential_keys[intermediate] = K1
+    for K2 in range(0x10000):
+        intermediate = decrypt_with_round_keys(known_ciphertext, key_expansion(K2))
+        if intermediate in potential_keys:
+            K1 = potential_keys[intermediate]
+            return (K1 << 16) | K2
+    return None
+
+# 用全密钥批量接口实现的同一攻击，返回结果与上面的循环相同：
+# 第一个命中的K2，以及中间值相同的K1中最大的一个（字典中后写入的覆盖先写入的）
+def _meet_in_the_middle_all_keys(known_plaintext, known_ciphertext):
+    import numpy as np
+    forward = narrow.encrypt_all_keys(known_plaintext)
+    last_k1 = np.full(0x100, -1, dtype=np.int64)
+    np.maximum.at(last_k1, forward, np.arange(0x10000))
+    candidates = last_k1[narrow.decrypt_all_keys(known_ciphertext)]
+    hits = np.flatnonzero(candidates >= 0)
+    if not len(hits):
+        return None
+    K2 = int(hits[0])
+    return (int(candidates[K2]) << 16) | K2
+
+# 多明密文对中间相遇攻击：每次处理的密钥段大小
+MITM_CHUNK_SIZE = 4096
+
+# 计算一段密钥对全部已知分组的中间值（进程池任务）
+# 结果按密钥顺序展开：values[(K - start) * n + j] 是第j个分组的中间值
+def _mitm_intermediates(task):
+    direction, blocks, start, stop = task
+    half = encrypt_with_round_keys if direction == 'forward' else decrypt_with_round_keys
+    values = array('H')
+    for K in range(start, stop):
+        round_keys = key_expansion(K)
+        values.extend([half(block, round_keys) for block in blocks])
+    return start, values
+
+# 对全部65536个密钥计算一个方向的中间值表；有NumPy时每个分组一次全密钥批量计算
+def _mitm_half_table(pool, direction, blocks):
+    n = len(blocks)
+    if narrow.HAVE_NUMPY:
+        import numpy as np
+        half = narrow.encrypt_all_keys if direction == 'forward' else narrow.decrypt_all_keys
+        columns = np.stack([half(block) for block in blocks], axis=1)
+        return array('H', columns.astype('=u2').tobytes())
+    tasks = [(direction, blocks, start, min(start + MITM_CHUNK_SIZE, 0x10000))
+             for start in range(0, 0x10000, MITM_CHUNK_SIZE)]
+    results = pool.map(_mitm_intermediates, tasks) if pool else map(_mitm_intermediates, tasks)
+    table = array('H', bytes(2 * 0x10000 * n))
+    for start, values in results:
+        table[start * n:start * n + len(values)] = values
+    return table
+
+# 桶下标：前两个分组的8位中间值拼成16位
+def _mitm_bucket(values):
+    index = 0
+    for value in values[:2]:
+        index = ((index << 8) ^ value) & 0xFFFF
+    return index
+
+def multi_pair_meet_in_the_middle(pairs, workers=None):
+    """Recover every 32-bit double-encryption key consistent with all known pairs.
+
+    `pairs` is a list of (plaintext, ciphertext) tuples. The forward
+    (encrypt under K1) and backward (decrypt under K2) halves are computed in
+    a process pool of `workers` processes (1 runs in-process), or with
+    `saes.narrow.encrypt_all_keys` when NumPy is installed. K1 candidates are
+    stored in a flat 16-bit indexed bucket table and a key survives only if its
+    intermediate values agree on every pair.
+
+    Returns (keys, timings) where keys is a sorted list of (K1 << 16) | K2 and
+    timings maps each phase name to its wall time in seconds.
+    """
+    if not pairs:
+        raise ValueError("At least one plaintext/ciphertext pair is required")
+    plaintexts = [p for p, _ in pairs]
+    ciphertexts = [c for _, c in pairs]
+    n = len(pairs)
+    workers = workers or os.cpu_count() or 1
+    timings = {}
+
+    pool = ProcessPoolExecutor(workers) if workers > 1 and not narrow.HAVE_NUMPY else None
+    try:
+        started = time.perf_counter()
+        forward = _mitm_half_table(pool, 'forward', plaintexts)
+        timings['forward'] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        backward = _mitm_half_table(pool, 'backward', ciphertexts)
+        timings['backward'] = time.perf_counter() - started
+    finally:
+        if pool:
+            pool.shutdown()
+
+    # 扁平桶表：heads[桶] 是最后放入的K1，chain[K1] 指向同桶的前一个K1，-1表示结束
+    started = time.perf_counter()
+    heads = array('l', [-1]) * 0x10000
+    chain = array('l', [-1]) * 0x10000
+    for K1 in range(0x10000):
+        bucket = _mitm_bucket(forward[K1 * n:K1 * n + n])
+        chain[K1] = heads[bucket]
+        heads[bucket] = K1
+    timings['index'] = time.perf_counter() - started
+
+    # 逐个K2查桶，并用其余分组的中间值过滤误报
+    started = time.perf_counter()
+    keys = []
+    for K2 in range(0x10000):
+        values = backward[K2 * n:K2 * n + n]
+        K1 = heads[_mitm_bucket(values)]
+        while K1 != -1:
+            if forward[K1 * n:K1 * n + n] == values:
+                keys.append((K1 << 16) | K2)
+            K1 = chain[K1]
+    keys.sort()
+    timings['match'] = time.perf_counter() - started
+    timings['total'] = sum(timings.values())
+    return keys, timings
@@ -0,0 +1,141 @@
+# 8位状态的S-AES变体（两个nibble、两轮、无列混淆），对应S-AES4.py/S-AES5.py
+# 只有全密钥批量接口需要NumPy，第一次调用时才导入，导入saes.modes/saes.multi不会加载NumPy
+import importlib.util
+
+from .common import S_BOX, INV_S_BOX, RCON1
+from .key_cache import KeyScheduleCache
+
+__all__ = [
+    'sub_nibbles', 'inv_sub_nibbles', 'shift_rows', 'inv_shift_rows', 'add_key', 'key_expansion',
+    'key_cache', 'expand_key', 'encrypt', 'decrypt', 'encrypt_with_round_keys', 'decrypt_with_round_keys',
+    'HAVE_NUMPY', 'all_key_schedule', 'encrypt_all_keys', 'decrypt_all_keys', 'encrypt_under_keys', 'decrypt_under_keys',
+]
+
+# S-AES辅助函数
+def sub_nibbles(state):
+    return [S_BOX[nibble] for nibble in state]
+
+def inv_sub_nibbles(state):
+    return [INV_S_BOX[nibble] for nibble in state]
+
+# 修改shift_rows和inv_shift_rows函数，使其适用于16位分组
+def shift_rows(state):
+    # 对于S-AES的16位分组，不需要实际的行移位
+    return state
+
+def inv_shift_rows(state):
+    # 对于S-AES的16位分组，不需要实际的逆行移位
+    return state
+
+def add_key(state, key):
+    return [s ^ k for s, k in zip(state, key)]
+
+def key_expansion(key):
+    w = [(key >> 8) & 0xFF, key & 0xFF]
+    w.append(w[0] ^ RCON1 ^ ((S_BOX[w[1] >> 4] << 4) | S_BOX[w[1] & 0x0F]))
+    w.append(w[2] ^ w[1])
+    return [(w[i] >> 4, w[i] & 0x0F) for i in range(4)]
+
+# 密钥扩展缓存，同一密钥只扩展一次
+key_cache = KeyScheduleCache(key_expansion)
+
+# 取得（缓存的）轮密钥，也可用于预先扩展密钥
+def expand_key(key):
+    return key_cache.get(key)
+
+# 加密和解密函数
+def encrypt(plaintext, key):
+    return encrypt_with_round_keys(plaintext, expand_key(key))
+
+def decrypt(ciphertext, key):
+    return decrypt_with_round_keys(ciphertext, expand_key(key))
+
+# 使用已扩展的轮密钥加解密
+def encrypt_with_round_keys(plaintext, round_keys):
+    state = [(plaintext >> 4) & 0xF, plaintext & 0xF]
+    state = add_key(state, round_keys[0])
+    state = sub_nibbles(state)
+    state = shift_rows(state)
+    state = add_key(state, round_keys[1])
+    state = sub_nibbles(state)
+    state = shift_rows(state)
+    state = add_key(state, round_keys[2])
+    return (state[0] << 4) | state[1]
+
+def decrypt_with_round_keys(ciphertext, round_keys):
+    state = [(ciphertext >> 4) & 0xF, ciphertext & 0xF]
+    state = add_key(state, round_keys[2])
+    state = inv_sub_nibbles(state)
+    state = inv_shift_rows(state)
+    state = add_key(state, round_keys[1])
+    state = inv_sub_nibbles(state)
+    state = inv_shift_rows(state)
+    state = add_key(state, round_keys[0])
+    return (state[0] << 4) | state[1]
+
+
+# 全密钥批量接口：同一个分组在全部65536个密钥下加解密，一次向量化计算
+# 是否可以使用全密钥批量接口（只查找NumPy，不导入）
+HAVE_NUMPY = importlib.util.find_spec('numpy') is not None
+
+_np = None
+_SUB_BYTES = _INV_SUB_BYTES = None
+
+# 导入NumPy并建立字节S盒表，只做一次
+def _numpy():
+    global _np, _SUB_BYTES, _INV_SUB_BYTES
+    if _np is None:
+        try:
+            import numpy
+        except ImportError:
+            raise ImportError("encrypt_all_keys/decrypt_all_keys require NumPy") from None
+        _SUB_BYTES = _byte_table(numpy, S_BOX)
+        _INV_SUB_BYTES = _byte_table(numpy, INV_S_BOX)
+        _np = numpy
+    return _np
+
+def _byte_table(np, nibble_table):
+    return np.array([nibble_table[b >> 4] << 4 | nibble_table[b & 0xF] for b in range(256)], dtype=np.uint16)
+
+_all_keys_schedule = None
+
+# 全部密钥的轮密钥（3个uint16数组，每个元素是一个字节的轮密钥），只计算一次
+def all_key_schedule():
+    """Round keys of all 65536 keys as three uint16 arrays (computed once)."""
+    global _all_keys_schedule
+    np = _numpy()
+    if _all_keys_schedule is None:
+        keys = np.arange(0x10000, dtype=np.uint16)
+        w0, w1 = keys >> 8, keys & 0xFF
+        w2 = w0 ^ RCON1 ^ _SUB_BYTES[w1]
+        _all_keys_schedule = (w0, w1, w2)
+    return _all_keys_schedule
+
+def encrypt_all_keys(block):
+    """Encrypt one 8-bit block under every key; result[K] == encrypt(block, K)."""
+    return encrypt_under_keys(block)
+
+def decrypt_all_keys(block):
+    """Decrypt one 8-bit block under every key; result[K] == decrypt(block, K)."""
+    return decrypt_under_keys(block)
+
+# 分组在一组密钥下加解密，blocks与keys按NumPy广播规则对应；keys为None时使用全部密钥
+def encrypt_under_keys(blocks, keys=None):
+    """Encrypt 8-bit `blocks` under the matching entries of `keys` (NumPy broadcasting)."""
+    np = _numpy()
+    k0, k1, k2 = all_key_schedule()
+    keys = np.arange(0x10000) if keys is None else keys
+    blocks, keys = np.broadcast_arrays(np.asarray(blocks, dtype=np.uint16) & 0xFF, np.asarray(keys, dtype=np.intp))
+    state = _SUB_BYTES[k0[keys] ^ blocks]
+    state = _SUB_BYTES[state ^ k1[keys]]
+    return state ^ k2[keys]
+
+def decrypt_under_keys(blocks, keys=None):
+    """Decrypt 8-bit `blocks` under the matching entries of `keys` (NumPy broadcasting)."""
+    np = _numpy()
+    k0, k1, k2 = all_key_schedule()
+    keys = np.arange(0x10000) if keys is None else keys
+    blocks, keys = np.broadcast_arrays(np.asarray(blocks, dtype=np.uint16) & 0xFF, np.asarray(keys, dtype=np.intp))
+    state = _INV_SUB_BYTES[k2[keys] ^ blocks]
+    state = _INV_SUB_BYTES[state ^ k1[keys]]
+    return state ^ k0[keys]
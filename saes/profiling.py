@@ -0,0 +1,153 @@
+# saes.mixcol（S-AES3）的轮函数级性能剖析
+# 开启时把saes.mixcol中的轮函数替换成带计数/计时的包装函数，关闭时换回原函数，
+# 所以不剖析时热路径上没有任何额外判断。例:
+#     with profile(trace=True) as p:
+#         mixcol.encrypt([0x6, 0xF, 0x6, 0xB], 0xA73B)
+#     print(p.to_json(indent=2))
+import json
+import time
+from contextlib import contextmanager
+
+from . import mixcol
+
+__all__ = ['PRIMITIVES', 'Profile', 'enable', 'disable', 'active', 'profile']
+
+# 被计数/计时的函数；时间是包含内部调用的累计时间（mix_columns的时间包含mult）
+PRIMITIVES = (
+    'add_key', 'sub_nibbles', 'shift_rows', 'mix_columns', 'inv_mix_columns', 'mult',
+    'key_expansion', 'encrypt_with_round_keys', 'decrypt_with_round_keys',
+)
+# 状态跟踪时记录这些轮函数的输出；每次add_key结束一轮
+_ROUND_STEPS = ('add_key', 'sub_nibbles', 'shift_rows', 'mix_columns', 'inv_mix_columns')
+_BLOCK_FUNCTIONS = ('encrypt_with_round_keys', 'decrypt_with_round_keys')
+
+_active = None
+_originals = {}
+
+
+class Profile:
+    """Call counters, cumulative nanosecond timers and an optional state trace."""
+
+    def __init__(self, trace=False, trace_limit=1000):
+        self.calls = dict.fromkeys(PRIMITIVES, 0)
+        self.ns = dict.fromkeys(PRIMITIVES, 0)
+        self.trace = [] if trace else None
+        self.trace_limit = trace_limit
+        self.cache = None
+        self._block = None
+
+    # 每个分组的跟踪记录：{'op', 'input', 'steps': [(轮, 函数名, 状态)], 'output'}
+    def _begin_block(self, name, state):
+        if self.trace is not None and len(self.trace) < self.trace_limit:
+            self._block = {'op': name.split('_')[0], 'input': mixcol.nibbles_to_block(state), 'steps': [], 'round': 0}
+            self.trace.append(self._block)
+        else:
+            self._block = None
+
+    def _step(self, name, state):
+        block = self._block
+        if block is not None:
+            block['steps'].append((block['round'], name, mixcol.nibbles_to_block(state)))
+            if name == 'add_key':
+                block['round'] += 1
+
+    def _end_block(self, state):
+        if self._block is not None:
+            self._block['output'] = mixcol.nibbles_to_block(state)
+            del self._block['round']
+            self._block = None
+
+    def as_dict(self):
+        """Return the measurements as plain data (JSON-serialisable)."""
+        result = {
+            'calls': dict(self.calls),
+            'ns': dict(self.ns),
+            'ns_per_call': {name: self.ns[name] / self.calls[name] for name in PRIMITIVES if self.calls[name]},
+            'key_cache': self.cache,
+        }
+        if self.trace is not None:
+            result['trace'] = [
+                {'op': b['op'], 'input': b['input'], 'output': b.get('output'),
+                 'steps': [{'round': r, 'step': name, 'state': state} for r, name, state in b['steps']]}
+                for b in self.trace
+            ]
+        return result
+
+    def to_json(self, **kwargs):
+        return json.dumps(self.as_dict(), **kwargs)
+
+
+def _wrap(profile, name, func):
+    calls, ns, clock = profile.calls, profile.ns, time.perf_counter_ns
+    if profile.trace is not None and name in _BLOCK_FUNCTIONS:
+        def wrapper(state, key_schedule):
+            profile._begin_block(name, state)
+            start = clock()
+            result = func(state, key_schedule)
+            ns[name] += clock() - start
+            calls[name] += 1
+            profile._end_block(result)
+            return result
+    elif profile.trace is not None and name in _ROUND_STEPS:
+        def wrapper(*args):
+            start = clock()
+            result = func(*args)
+            ns[name] += clock() - start
+            calls[name] += 1
+            profile._step(name, result)
+            return result
+    else:
+        def wrapper(*args):
+            start = clock()
+            result = func(*args)
+            ns[name] += clock() - start
+            calls[name] += 1
+            return result
+    wrapper.__name__ = wrapper.__qualname__ = name
+    wrapper.__wrapped__ = func
+    return wrapper
+
+
+# 开始剖析：替换saes.mixcol中的函数（密钥缓存使用的扩展函数也一起替换）
+def enable(trace=False, trace_limit=1000):
+    """Start profiling `saes.mixcol`; returns the `Profile` being filled."""
+    global _active
+    if _active is not None:
+        raise RuntimeError("Profiling is already enabled")
+    profile = Profile(trace, trace_limit)
+    profile.cache = mixcol.key_cache.stats()
+    for name in PRIMITIVES:
+        _originals[name] = getattr(mixcol, name)
+        setattr(mixcol, name, _wrap(profile, name, _originals[name]))
+    _originals['key_cache.expand'] = mixcol.key_cache.expand
+    mixcol.key_cache.expand = mixcol.key_expansion
+    _active = profile
+    return profile
+
+# 结束剖析，恢复原函数；返回结果并记录期间密钥缓存的命中/未命中次数
+def disable():
+    """Stop profiling and restore the original functions."""
+    global _active
+    profile = _active
+    if profile is None:
+        return None
+    mixcol.key_cache.expand = _originals.pop('key_cache.expand')
+    for name in PRIMITIVES:
+        setattr(mixcol, name, _originals.pop(name))
+    before, after = profile.cache, mixcol.key_cache.stats()
+    profile.cache = {'hits': after['hits'] - before['hits'], 'misses': after['misses'] - before['misses']}
+    _active = None
+    return profile
+
+def active():
+    """Return the running `Profile`, or None when profiling is off."""
+    return _active
+
+@contextmanager
+def profile(trace=False, trace_limit=1000):
+    """Profile `saes.mixcol` inside a `with` block."""
+    result = enable(trace, trace_limit)
+    try:
+        yield result
+    finally:
+        disable()
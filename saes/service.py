@@ -0,0 +1,200 @@
+# 本地asyncio加解密服务：长度前缀的二进制协议，同时到达的请求合并成批量加解密调用
+# 用法: python -m saes.service --port 8765   或   python -m saes.service --unix /tmp/saes.sock
+#
+# 帧格式：4字节大端长度 + 负载
+#   请求负载：请求号(4字节) 操作码(1字节) 密钥(8字节) IV(2字节) 数据
+#   响应负载：请求号(4字节) 状态(1字节，0成功/1失败) 结果数据或UTF-8错误信息
+# 一个连接上可以连续发送多个请求，响应按完成顺序返回，用请求号对应。
+import argparse
+import asyncio
+import io
+import struct
+from concurrent.futures import ThreadPoolExecutor
+
+from . import mixcol, modes
+
+__all__ = [
+    'OP_ENCRYPT', 'OP_DECRYPT', 'OP_CBC_ENCRYPT', 'OP_CBC_DECRYPT', 'STATUS_OK', 'STATUS_ERROR',
+    'MAX_FRAME_SIZE', 'process_batch', 'CipherServer',
+]
+
+# 操作码：ENCRYPT/DECRYPT 是saes.mixcol的2字节分组（数据需按分组对齐，不填充），
+# CBC_* 是saes.modes的CBC模式（每字节一个分组）
+OP_ENCRYPT, OP_DECRYPT, OP_CBC_ENCRYPT, OP_CBC_DECRYPT = 1, 2, 3, 4
+STATUS_OK, STATUS_ERROR = 0, 1
+
+LENGTH = struct.Struct('>I')
+REQUEST_HEADER = struct.Struct('>IBQH')
+RESPONSE_HEADER = struct.Struct('>IB')
+MAX_FRAME_SIZE = 16 * 1024 * 1024
+
+
+def _cbc(op, key, iv, data):
+    out = io.BytesIO()
+    crypt_stream = modes.cbc_encrypt_stream if op == OP_CBC_ENCRYPT else modes.cbc_decrypt_stream
+    crypt_stream(data, out, key, iv)
+    return out.getvalue()
+
+# 处理一批请求 [(op, key, iv, data)]，返回 [(ok, 结果或错误信息)]
+# 同一操作、同一密钥的分组请求拼接起来只调用一次批量加解密
+def process_batch(items):
+    """Process a batch of requests, returning (ok, bytes-or-message) per item."""
+    results = [None] * len(items)
+    groups = {}
+    for index, (op, key, iv, data) in enumerate(items):
+        try:
+            if op in (OP_ENCRYPT, OP_DECRYPT):
+                if len(data) % mixcol.BLOCK_SIZE:
+                    raise ValueError(f"Data length must be a multiple of {mixcol.BLOCK_SIZE} bytes")
+                if key > 0xFFFF:
+                    raise ValueError("Key must be 16 bits")
+                groups.setdefault((op, key), []).append(index)
+            elif op in (OP_CBC_ENCRYPT, OP_CBC_DECRYPT):
+                results[index] = (True, _cbc(op, key, iv, data))
+            else:
+                raise ValueError(f"Unknown operation {op}")
+        except ValueError as e:
+            results[index] = (False, str(e))
+
+    for (op, key), indexes in groups.items():
+        buffer = bytearray(b''.join(items[i][3] for i in indexes))
+        (mixcol.encrypt_into if op == OP_ENCRYPT else mixcol.decrypt_into)(buffer, key)
+        offset = 0
+        for i in indexes:
+            length = len(items[i][3])
+            results[i] = (True, bytes(buffer[offset:offset + length]))
+            offset += length
+    return results
+
+
+class CipherServer:
+    """Asyncio encryption server that batches concurrent requests.
+
+    Requests arriving within `batch_window` seconds (or until `max_batch` are
+    queued) are processed together. Batches larger than `inline_limit` bytes
+    run in `executor` so the event loop stays responsive.
+    """
+
+    def __init__(self, executor=None, batch_window=0.002, max_batch=256, inline_limit=16 * 1024):
+        self.executor = executor or ThreadPoolExecutor()
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.inline_limit = inline_limit
+        self.stats = {'requests': 0, 'batches': 0, 'executor_batches': 0}
+        self._pending = []
+        self._flush_handle = None
+        self._server = None
+
+    async def start(self, host='127.0.0.1', port=0, path=None):
+        """Listen on a Unix socket `path`, or on TCP `host`:`port`."""
+        if path:
+            self._server = await asyncio.start_unix_server(self._handle, path=path)
+        else:
+            self._server = await asyncio.start_server(self._handle, host, port)
+        return self._server.sockets[0].getsockname()
+
+    async def serve_forever(self):
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+        self.executor.shutdown(wait=False)
+
+    # 提交一个请求，等待它所在批次处理完
+    def submit(self, op, key, iv, data):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append(((op, key, iv, data), future))
+        self.stats['requests'] += 1
+        if len(self._pending) >= self.max_batch:
+            self._schedule_flush(0)
+        elif self._flush_handle is None:
+            self._schedule_flush(self.batch_window)
+        return future
+
+    def _schedule_flush(self, delay):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+        loop = asyncio.get_running_loop()
+        self._flush_handle = loop.call_later(delay, lambda: asyncio.ensure_future(self._flush()))
+
+    async def _flush(self):
+        self._flush_handle = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        items = [item for item, _ in batch]
+        self.stats['batches'] += 1
+        try:
+            if sum(len(item[3]) for item in items) <= self.inline_limit:
+                results = process_batch(items)
+            else:
+                self.stats['executor_batches'] += 1
+                results = await asyncio.get_running_loop().run_in_executor(self.executor, process_batch, items)
+        except Exception as e:
+            results = [(False, f"Internal error: {e}")] * len(items)
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    async def _respond(self, writer, lock, request_id, op, key, iv, data):
+        ok, result = await self.submit(op, key, iv, data)
+        body = result if ok else result.encode('utf-8')
+        payload = RESPONSE_HEADER.pack(request_id, STATUS_OK if ok else STATUS_ERROR) + body
+        async with lock:
+            writer.write(LENGTH.pack(len(payload)) + payload)
+            await writer.drain()
+
+    async def _handle(self, reader, writer):
+        lock = asyncio.Lock()
+        tasks = set()
+        try:
+            while True:
+                try:
+                    (length,) = LENGTH.unpack(await reader.readexactly(LENGTH.size))
+                    if not REQUEST_HEADER.size <= length <= MAX_FRAME_SIZE:
+                        break
+                    payload = await reader.readexactly(length)
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                request_id, op, key, iv = REQUEST_HEADER.unpack_from(payload)
+                task = asyncio.ensure_future(
+                    self._respond(writer, lock, request_id, op, key, iv, payload[REQUEST_HEADER.size:]))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        finally:
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+            writer.close()
+
+
+async def _serve(args):
+    server = CipherServer(batch_window=args.batch_window / 1000, max_batch=args.max_batch)
+    address = await server.start(args.host, args.port, args.unix)
+    print(f"Serving on {address}", flush=True)
+    try:
+        await server.serve_forever()
+    finally:
+        await server.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local S-AES encryption service")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix', help="listen on this Unix socket path instead of TCP")
+    parser.add_argument('--batch-window', type=float, default=2.0, help="batching window in milliseconds")
+    parser.add_argument('--max-batch', type=int, default=256, help="flush a batch at this many requests")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,178 @@
+# CBC密文篡改（错误传播）实验：大量篡改方式逐一试验并统计被破坏的明文位
+# CBC中改动一个密文分组只影响该分组和下一个分组的明文，因此每次试验只重新解密受影响的分组，
+# 其余分组直接沿用基准明文。分组与saes.modes的流式CBC相同（每字节一个分组）。
+#
+# 篡改方式（元组）：
+#   ('flip', i, mask)         第i个密文分组异或mask
+#   ('swap', i, j)            交换第i、j个密文分组
+#   ('truncate', start, stop) 接收方只收到密文[start:stop]，仍用原IV解密
+#   ('iv', mask)              IV异或mask
+import io
+import itertools
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from .modes import byte_tables, cbc_encrypt_stream
+
+__all__ = ['KINDS', 'bit_flips', 'iv_flips', 'random_patterns', 'run_trial', 'run_experiment']
+
+KINDS = ('flip', 'swap', 'truncate', 'iv')
+
+# 每个进程任务处理的篡改方式数
+CHUNK_SIZE = 20000
+
+
+# 全部单比特翻转
+def bit_flips(blocks):
+    """Yield every single-bit flip of a `blocks`-block ciphertext."""
+    for i in range(blocks):
+        for bit in range(8):
+            yield ('flip', i, 1 << bit)
+
+def iv_flips():
+    """Yield every single-bit flip of the IV."""
+    for bit in range(8):
+        yield ('iv', 1 << bit)
+
+# 随机篡改方式，kinds中各类型等概率出现
+def random_patterns(count, blocks, kinds=KINDS, seed=None):
+    """Yield `count` random tamper patterns for a `blocks`-block ciphertext."""
+    rng = random.Random(seed)
+    for _ in range(count):
+        kind = rng.choice(kinds)
+        if kind == 'flip':
+            yield ('flip', rng.randrange(blocks), rng.randrange(1, 256))
+        elif kind == 'swap':
+            yield ('swap',) + tuple(sorted(rng.sample(range(blocks), 2)))
+        elif kind == 'truncate':
+            start = rng.randrange(blocks)
+            yield ('truncate', start, rng.randrange(start + 1, blocks + 1))
+        else:
+            yield ('iv', rng.randrange(1, 256))
+
+
+# 对一种篡改只重新解密受影响的分组
+# 返回 (受影响分组相对篡改位置的偏移与明文差值的列表, 丢失的分组数)
+def run_trial(pattern, plaintext, ciphertext, decrypt_table, iv):
+    """Apply one tamper pattern; returns ([(block offset, xor difference)], lost blocks)."""
+    kind = pattern[0]
+    n = len(ciphertext)
+    lost = 0
+    if kind == 'truncate':
+        start, stop = pattern[1], pattern[2]
+        lost = n - (stop - start)
+        if start == 0:
+            return [], lost
+        # 第一个收到的分组和原IV链接，之后的分组链接关系不变
+        diff = decrypt_table[ciphertext[start]] ^ (iv & 0xFF) ^ plaintext[start]
+        return [(0, diff)] if diff else [], lost
+
+    if kind == 'flip':
+        modified = {pattern[1]: ciphertext[pattern[1]] ^ pattern[2]}
+        new_iv, anchor = iv & 0xFF, pattern[1]
+    elif kind == 'swap':
+        i, j = pattern[1], pattern[2]
+        modified = {i: ciphertext[j], j: ciphertext[i]}
+        new_iv, anchor = iv & 0xFF, min(i, j)
+    elif kind == 'iv':
+        modified = {}
+        new_iv, anchor = (iv ^ pattern[1]) & 0xFF, 0
+    else:
+        raise ValueError(f"Unknown tamper pattern {pattern!r}")
+
+    affected = {0} if kind == 'iv' else set()
+    for position in modified:
+        affected.update((position, position + 1))
+    diffs = []
+    for k in sorted(affected):
+        if k >= n:
+            continue
+        block = modified.get(k, ciphertext[k])
+        previous = modified.get(k - 1, ciphertext[k - 1]) if k else new_iv
+        diff = decrypt_table[block] ^ previous ^ plaintext[k]
+        if diff:
+            diffs.append((k - anchor, diff))
+    return diffs, lost
+
+
+def _new_stats():
+    return {'trials': 0, 'affected_trials': 0, 'corrupted_blocks': 0, 'corrupted_bits': 0,
+            'lost_blocks': 0, 'bit_positions': [0] * 8, 'block_offsets': {}}
+
+def _merge(total, part):
+    for kind, stats in part.items():
+        into = total.setdefault(kind, _new_stats())
+        for name in ('trials', 'affected_trials', 'corrupted_blocks', 'corrupted_bits', 'lost_blocks'):
+            into[name] += stats[name]
+        into['bit_positions'] = [a + b for a, b in zip(into['bit_positions'], stats['bit_positions'])]
+        for offset, count in stats['block_offsets'].items():
+            into['block_offsets'][offset] = into['block_offsets'].get(offset, 0) + count
+
+def _run_chunk(patterns, plaintext, ciphertext, decrypt_table, iv):
+    result = {}
+    for pattern in patterns:
+        diffs, lost = run_trial(pattern, plaintext, ciphertext, decrypt_table, iv)
+        stats = result.get(pattern[0])
+        if stats is None:
+            stats = result[pattern[0]] = _new_stats()
+        stats['trials'] += 1
+        stats['lost_blocks'] += lost
+        if diffs:
+            stats['affected_trials'] += 1
+        stats['corrupted_blocks'] += len(diffs)
+        offsets, positions = stats['block_offsets'], stats['bit_positions']
+        for offset, diff in diffs:
+            offsets[offset] = offsets.get(offset, 0) + 1
+            stats['corrupted_bits'] += bin(diff).count('1')
+            for bit in range(8):
+                if diff >> bit & 1:
+                    positions[bit] += 1
+    return result
+
+# 进程池中每个进程只接收一次消息和解密表
+_worker_args = None
+
+def _init_worker(*args):
+    global _worker_args
+    _worker_args = args
+
+def _worker_chunk(patterns):
+    return _run_chunk(patterns, *_worker_args)
+
+
+def run_experiment(plaintext, key, iv, patterns, workers=1, chunk_size=CHUNK_SIZE):
+    """Encrypt `plaintext` with CBC and run every tamper pattern against it.
+
+    `patterns` may be any iterable (e.g. a generator of millions of tuples);
+    it is consumed in chunks of `chunk_size`, in a pool of `workers`
+    processes when workers > 1. Returns {'blocks', 'trials', 'kinds'} where
+    'kinds' maps each pattern kind to its aggregated statistics.
+    """
+    plaintext = bytes(plaintext)
+    out = io.BytesIO()
+    cbc_encrypt_stream(plaintext, out, key, iv)
+    args = (plaintext, out.getvalue(), byte_tables(key)[1], iv)
+    patterns = iter(patterns)
+    chunks = iter(lambda: list(itertools.islice(patterns, chunk_size)), [])
+    workers = workers or os.cpu_count() or 1
+    kinds = {}
+
+    if workers == 1:
+        for chunk in chunks:
+            _merge(kinds, _run_chunk(chunk, *args))
+    else:
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=args) as pool:
+            pending = set()
+            for chunk in chunks:
+                pending.add(pool.submit(_worker_chunk, chunk))
+                if len(pending) >= 2 * workers:  # 限制排队中的任务数，模式生成器不会被一次读完
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        _merge(kinds, future.result())
+            for future in pending:
+                _merge(kinds, future.result())
+
+    for stats in kinds.values():
+        stats['block_offsets'] = dict(sorted(stats['block_offsets'].items()))
+    return {'blocks': len(plaintext), 'trials': sum(s['trials'] for s in kinds.values()), 'kinds': kinds}
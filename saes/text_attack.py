@@ -0,0 +1,139 @@
+# 唯密文攻击：针对S-AES3.py文本模式（每2个字符一个分组，saes.mixcol.encrypt_text）
+# 在全部65536个密钥下批量解密密文开头的几个分组，出现不可打印字符的密钥立即淘汰；
+# 剩下的密钥解密整段样本，按可打印字符比例和英文字母频率打分，返回排好序的候选列表。
+# 用法: python -m saes.text_attack --workers 4 --top 5 6a1f2b...（密文的十六进制）
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from . import mixcol
+
+__all__ = ['ENGLISH_FREQUENCIES', 'PRINTABLE', 'score_plaintext', 'recover_text_key']
+
+# 每个进程任务处理的密钥数
+CHUNK_SIZE = 4096
+
+# 英文字母（含空格）在文本中的出现频率
+ENGLISH_FREQUENCIES = {
+    ' ': 0.1918, 'e': 0.1041, 't': 0.0729, 'a': 0.0651, 'o': 0.0596, 'n': 0.0564, 'i': 0.0558,
+    's': 0.0515, 'r': 0.0498, 'h': 0.0493, 'd': 0.0350, 'l': 0.0331, 'u': 0.0225, 'c': 0.0214,
+    'm': 0.0202, 'f': 0.0197, 'w': 0.0171, 'g': 0.0158, 'y': 0.0146, 'p': 0.0137, 'b': 0.0124,
+    'v': 0.0080, 'k': 0.0051, 'x': 0.0013, 'j': 0.0009, 'q': 0.0008, 'z': 0.0006,
+}
+
+# 可打印字节：ASCII可见字符、空格和常见空白符
+PRINTABLE = np.zeros(256, dtype=bool)
+PRINTABLE[0x20:0x7F] = True
+PRINTABLE[[0x09, 0x0A, 0x0D]] = True
+
+
+# 返回 (可打印字节比例, 字母频率的卡方距离)；卡方越小越像英文
+def score_plaintext(data):
+    """Score candidate plaintext bytes by printable fraction and English letter fit."""
+    data = bytes(data)
+    if not data:
+        return 0.0, float('inf')
+    printable = int(PRINTABLE[np.frombuffer(data, dtype=np.uint8)].sum()) / len(data)
+    text = data.decode('latin-1').lower()
+    letters = sum(text.count(c) for c in ENGLISH_FREQUENCIES)
+    if not letters:
+        return printable, float('inf')
+    chi2 = 0.0
+    for c, frequency in ENGLISH_FREQUENCIES.items():
+        expected = frequency * letters
+        chi2 += (text.count(c) - expected) ** 2 / expected
+    # 非字母字符越多越不像英文：按字母比例放大
+    return printable, chi2 * len(data) / letters
+
+
+def _printable_block(blocks):
+    return PRINTABLE[blocks >> 8] & PRINTABLE[blocks & 0xFF]
+
+# 检查一段密钥（进程池任务）：逐个分组淘汰，幸存者解密整段样本后打分
+def _search_range(task):
+    prune_blocks, sample, padded, start, stop = task
+    keys = np.arange(start, stop)
+    for block in prune_blocks:
+        keys = keys[_printable_block(mixcol.decrypt_under_keys(block, keys))]
+        if not keys.size:
+            return []
+    results = []
+    for key in keys:
+        plaintext = bytearray(sample)
+        mixcol.decrypt_into(plaintext, int(key))
+        if padded:  # 样本包含最后一个分组时去掉合法的填充
+            try:
+                plaintext = mixcol.unpad_bytes(plaintext)
+            except ValueError:
+                pass
+        printable, chi2 = score_plaintext(plaintext)
+        results.append((printable, chi2, int(key), bytes(plaintext)))
+    return results
+
+
+def recover_text_key(ciphertext, top=10, prune=4, sample_blocks=256, min_printable=0.0, workers=None):
+    """Rank keys for an `encrypt_text`/`encrypt_bytes` ciphertext from the ciphertext alone.
+
+    Keys whose first `prune` blocks decrypt to anything unprintable are
+    dropped; survivors decrypt the first `sample_blocks` blocks and are
+    scored with `score_plaintext` (after stripping the padding when the
+    sample reaches the end of the ciphertext). Returns up to `top` dicts,
+    best first, with 'key', 'printable', 'chi2' and 'plaintext'.
+    """
+    if isinstance(ciphertext, str):
+        ciphertext = ciphertext.encode('latin-1')
+    ciphertext = bytes(ciphertext)
+    if not ciphertext or len(ciphertext) % mixcol.BLOCK_SIZE:
+        raise ValueError(f"Ciphertext length must be a non-zero multiple of {mixcol.BLOCK_SIZE} bytes")
+    blocks = np.frombuffer(ciphertext, dtype='>u2').astype(np.uint16)
+    # 最后一个分组可能含填充字节，不用于淘汰（只有一个分组时不淘汰，全部密钥直接打分）
+    prune_blocks = [int(b) for b in blocks[:min(prune, len(blocks) - 1)]]
+    sample = ciphertext[:sample_blocks * mixcol.BLOCK_SIZE]
+    padded = len(sample) == len(ciphertext)
+    tasks = [(prune_blocks, sample, padded, start, min(start + CHUNK_SIZE, 0x10000))
+             for start in range(0, 0x10000, CHUNK_SIZE)]
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1:
+        parts = map(_search_range, tasks)
+    else:
+        with ProcessPoolExecutor(workers) as pool:
+            parts = list(pool.map(_search_range, tasks))
+    candidates = [c for part in parts for c in part if c[0] >= min_printable]
+    # 可打印比例相差不到1%时按字母频率排序
+    candidates.sort(key=lambda c: (-round(c[0], 2), c[1], c[2]))
+    return [{'key': key, 'printable': printable, 'chi2': chi2, 'plaintext': plaintext}
+            for printable, chi2, key, plaintext in candidates[:top]]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ciphertext-only key search for the S-AES3 text mode")
+    parser.add_argument('ciphertext', nargs='?', help="ciphertext as hex (or use --file)")
+    parser.add_argument('--file', help="read the raw ciphertext from this file")
+    parser.add_argument('--top', type=int, default=10)
+    parser.add_argument('--prune', type=int, default=4, help="blocks that must decrypt to printable text")
+    parser.add_argument('--workers', type=int, default=None, help="number of processes (default: CPU count)")
+    args = parser.parse_args(argv)
+    if args.file:
+        with open(args.file, 'rb') as f:
+            ciphertext = f.read()
+    elif args.ciphertext:
+        ciphertext = bytes.fromhex(args.ciphertext)
+    else:
+        parser.error("give the ciphertext as hex or with --file")
+
+    results = recover_text_key(ciphertext, args.top, args.prune, workers=args.workers)
+    if not results:
+        print("No candidate key found", file=sys.stderr)
+        return 1
+    for r in results:
+        print(f"{r['key']:#06x} printable {r['printable']:.3f} chi2 {r['chi2']:10.1f}  "
+              f"{r['plaintext'][:40].decode('latin-1')!r}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
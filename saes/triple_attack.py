@@ -0,0 +1,231 @@
+# 三重加密（S-AES4.py中triple_encrypt的mode=2：K1-K2-K3三个独立的16位密钥，共48位）的已知明文密钥恢复
+# C = E_K3(D_K2(E_K1(P)))，在第一层之后相遇：
+#   单密钥一侧 m = E_K1(P)：2^16个K1，前MATCH_PAIRS个分组的中间值拼成64位整数后排序，常驻内存
+#   两密钥一侧 m = E_K2(D_K3(C))：2^32个(K2, K3)不存表，按K3分批流式计算
+# 固定K3后，全部K2的中间值就是K2加密码本（256×65536字节）中的几行。先用前3个中间值（24位）查位图，
+# 只有约1/256的K2需要在排序表中二分查找，命中后再用其余明密文对核对。
+# 内存上限在各进程间平分，决定每批处理的K3个数；单核约1分钟搜完全部2^48个密钥。
+# 分组只有8位，不同密钥的三重加密可能在大部分明文上一致，只给8对时偶尔会多出一两个密钥，多给几对即可排除。
+# 用法: python -m saes.triple_attack --workers 4 ab:3c 12:f0 ...（明文:密文，十六进制）
+#       python -m saes.triple_attack --key 0x123456789ABC   用随机明文生成12个已知明密文对演示
+import argparse
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, as_completed, wait
+
+import numpy as np
+
+from . import narrow
+from .multi import triple_encrypt
+
+__all__ = ['MATCH_PAIRS', 'MIN_PAIRS', 'DEFAULT_MEMORY_LIMIT', 'triple_meet_in_the_middle']
+
+# 参与相遇比较的明密文对数（8个8位中间值正好拼成一个64位整数），其余的对只用于核对
+MATCH_PAIRS = 8
+# 少于4对时符合条件的密钥超过2^24个
+MIN_PAIRS = 4
+# 位图使用的中间值位数（前3个分组）
+PREFIX_BITS = 24
+# 默认的总内存上限
+DEFAULT_MEMORY_LIMIT = 256 << 20
+# 每批最多处理的K3个数（再大也不会更快）
+MAX_BATCH = 16
+
+# 每个进程的固定内存：K2加密码本、位图、排序后的K1表及其下标
+_FIXED_BYTES = 256 * 0x10000 + (1 << PREFIX_BITS >> 3) + 16 * 0x10000
+# 每个K3的工作内存：全部K2的24位前缀及位图查询的临时数组
+_BYTES_PER_K3 = 16 * 0x10000
+
+
+# 去掉重复的明密文对；同一明文对应不同密文时不可能有解
+def _check_pairs(pairs):
+    table = {}
+    for plaintext, ciphertext in pairs:
+        plaintext, ciphertext = plaintext & 0xFF, ciphertext & 0xFF
+        if table.setdefault(plaintext, ciphertext) != ciphertext:
+            raise ValueError(f"Plaintext {plaintext:#04x} is paired with two different ciphertexts")
+    if len(table) < MIN_PAIRS:
+        raise ValueError(f"At least {MIN_PAIRS} pairs with distinct plaintexts are required, got {len(table)}")
+    return list(table.items())
+
+
+# 单密钥一侧的排序表、位图和K2加密码本，只建一次
+def _build_tables(pairs):
+    keys = np.arange(0x10000)
+    matched = pairs[:MATCH_PAIRS]
+    plaintexts = np.array([p for p, _ in matched])
+    ciphertexts = np.array([c for _, c in matched])
+    # 单密钥一侧：第j个中间值放在64位整数的第j个字节
+    forward = np.zeros((0x10000, 8), dtype=np.uint8)
+    forward[:, :len(matched)] = narrow.encrypt_under_keys(plaintexts[None, :], keys[:, None])
+    values = forward.view('<u8').ravel()
+    order = np.argsort(values, kind='stable')
+    present = np.zeros(1 << PREFIX_BITS, dtype=bool)
+    present[(values & ((1 << PREFIX_BITS) - 1)).astype(np.intp)] = True
+    # codebook[x, K2] == encrypt(x, K2)
+    codebook = narrow.encrypt_under_keys(np.arange(0x100)[:, None], keys[None, :]).astype(np.uint8)
+    return pairs, ciphertexts, codebook, np.packbits(present, bitorder='little'), values[order], order
+
+# 进程池中每个进程只接收一次表
+_tables = None
+
+def _init_worker(tables):
+    global _tables
+    _tables = tables
+
+# 搜索一段K3（进程池任务），返回 (K3个数, 符合全部明密文对的密钥)
+def _search_k3(task):
+    start, stop = task
+    pairs, ciphertexts, codebook, bitmap, values, order = _tables
+    # 第三层解密后的值，形状 (K3个数, 分组数)
+    middle = narrow.decrypt_under_keys(ciphertexts[None, :], np.arange(start, stop)[:, None]).astype(np.intp)
+    prefix = codebook[middle[:, 0]].astype(np.uint32)
+    for j in range(1, PREFIX_BITS // 8):
+        prefix |= codebook[middle[:, j]].astype(np.uint32) << (8 * j)
+    rows, k2s = np.nonzero((bitmap[prefix >> 3] >> (prefix & 7)) & 1)
+    # 通过位图的(K3, K2)才计算完整的64位中间值
+    full = np.zeros(len(k2s), dtype=np.uint64)
+    for j in range(middle.shape[1]):
+        full |= codebook[middle[rows, j], k2s].astype(np.uint64) << np.uint64(8 * j)
+    low = np.searchsorted(values, full, 'left')
+    high = np.searchsorted(values, full, 'right')
+    keys = []
+    for i in np.flatnonzero(high > low):
+        K2, K3 = int(k2s[i]), start + int(rows[i])
+        for K1 in order[low[i]:high[i]]:
+            key = (int(K1) << 32) | (K2 << 16) | K3
+            if all(triple_encrypt(p, key, mode=2) == c for p, c in pairs[MATCH_PAIRS:]):
+                keys.append(key)
+    return stop - start, keys
+
+
+def triple_meet_in_the_middle(pairs, workers=None, memory_limit=DEFAULT_MEMORY_LIMIT, k3_range=(0, 0x10000),
+                              progress=None):
+    """Recover every 48-bit `triple_encrypt(..., mode=2)` key consistent with all known pairs.
+
+    `pairs` is a list of (plaintext, ciphertext) tuples with at least
+    `MIN_PAIRS` distinct plaintexts; the first `MATCH_PAIRS` are matched in
+    the middle and the rest only confirm candidates. `memory_limit` (bytes)
+    is shared by the `workers` processes (1 runs in-process) and sets how
+    many K3 values each task covers. Only K3 in `k3_range` is searched.
+    `progress(done, total, eta_seconds)` is called after each task.
+
+    Returns (keys, stats) where keys is a sorted list of
+    (K1 << 32) | (K2 << 16) | K3 and stats holds the search size and timing ('seconds' excludes
+    building the tables, 'table_seconds').
+    """
+    pairs = _check_pairs(pairs)
+    start, stop = k3_range
+    if not 0 <= start < stop <= 0x10000:
+        raise ValueError(f"k3_range must satisfy 0 <= start < stop <= 0x10000, got {start:#x}:{stop:#x}")
+    workers = workers or os.cpu_count() or 1
+    spare = memory_limit // workers - _FIXED_BYTES
+    if spare < _BYTES_PER_K3:
+        raise ValueError(f"memory_limit too small: each of {workers} worker(s) needs at least "
+                         f"{(_FIXED_BYTES + _BYTES_PER_K3) >> 20} MiB")
+    batch = min(MAX_BATCH, spare // _BYTES_PER_K3)
+    tasks = ((k, min(k + batch, stop)) for k in range(start, stop, batch))
+    total = stop - start
+    done = 0
+    keys = []
+    started = time.perf_counter()
+    tables = _build_tables(pairs)
+    table_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+
+    def record(result):
+        nonlocal done
+        count, found = result
+        done += count
+        keys.extend(found)
+        if progress:
+            elapsed = time.perf_counter() - started
+            progress(done, total, elapsed * (total - done) / done)
+
+    global _tables
+    if workers == 1:
+        try:
+            _init_worker(tables)
+            for task in tasks:
+                record(_search_k3(task))
+        finally:
+            _tables = None
+    else:
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(tables,)) as pool:
+            pending = set()
+            for task in tasks:
+                pending.add(pool.submit(_search_k3, task))
+                if len(pending) >= 2 * workers:  # 限制排队中的任务数
+                    finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        record(future.result())
+            for future in as_completed(pending):
+                record(future.result())
+
+    seconds = time.perf_counter() - started
+    keys.sort()
+    return keys, {
+        'pairs': len(pairs), 'matched_pairs': min(len(pairs), MATCH_PAIRS), 'k3_searched': done,
+        'keys_searched': done << 32, 'batch': batch, 'workers': workers, 'table_seconds': table_seconds,
+        'seconds': seconds,
+        'keys_per_second': (done << 32) / seconds if seconds else 0.0,
+    }
+
+
+def _parse_pair(text):
+    plaintext, ciphertext = (int(x, 16) for x in text.split(':'))
+    return plaintext, ciphertext
+
+def _parse_size(text):
+    units = {'K': 1 << 10, 'M': 1 << 20, 'G': 1 << 30}
+    if text[-1:].upper() in units:
+        return int(float(text[:-1]) * units[text[-1].upper()])
+    return int(text)
+
+def _parse_range(text):
+    start, stop = (int(x, 0) for x in text.split(':'))
+    return start, stop
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Meet-in-the-middle key recovery for 48-bit triple encryption (mode 2)")
+    parser.add_argument('pairs', nargs='*', type=_parse_pair, help="known pairs PLAINTEXT:CIPHERTEXT in hex")
+    parser.add_argument('--key', type=lambda s: int(s, 0), help="generate the pairs from this 48-bit key instead")
+    parser.add_argument('--pairs', dest='count', type=int, default=MATCH_PAIRS + 4, help="pairs generated with --key")
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--workers', type=int, default=None, help="number of processes (default: CPU count)")
+    parser.add_argument('--memory', type=_parse_size, default=DEFAULT_MEMORY_LIMIT,
+                        help="total memory limit, e.g. 512M (default 256M)")
+    parser.add_argument('--k3', type=_parse_range, default=(0, 0x10000), help="search only K3 in START:STOP")
+    args = parser.parse_args(argv)
+    pairs = args.pairs
+    if args.key is not None:
+        plaintexts = random.Random(args.seed).sample(range(0x100), args.count)
+        pairs = [(p, triple_encrypt(p, args.key, mode=2)) for p in plaintexts]
+    if not pairs:
+        parser.error("give known pairs or --key")
+    print("pairs: " + " ".join(f"{p:02x}:{c:02x}" for p, c in pairs))
+
+    def progress(done, total, eta):
+        print(f"\rK3 {done}/{total} ({100 * done / total:5.1f}%), ETA {eta:6.0f} s", end='', file=sys.stderr,
+              flush=True)
+
+    try:
+        keys, stats = triple_meet_in_the_middle(pairs, args.workers, args.memory, args.k3, progress)
+    except ValueError as e:
+        parser.error(str(e))
+    print(file=sys.stderr)
+    for key in keys:
+        print(f"{key:#014x}" + (" (real key)" if key == args.key else ""))
+    print(f"{len(keys)} key(s), {stats['keys_searched']} keys searched in {stats['seconds']:.1f} s "
+          f"(+{stats['table_seconds']:.1f} s tables, {stats['keys_per_second'] / 1e9:.0f} G keys/s, "
+          f"{stats['workers']} worker(s), {stats['batch']} K3 per task)")
+    if args.key is not None and args.key not in keys:
+        in_range = args.k3[0] <= (args.key & 0xFFFF) < args.k3[1]
+        print("real key not found" + ("" if in_range else " (its K3 is outside --k3)"))
+    return 0 if keys else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,287 @@
+# 全空间验证：对每个密钥、每个分组检查 decrypt(encrypt(p, k), k) == p，并核对各实现之间的一致性
+#   saes2   无列混淆的16位S-AES（saes.basic），2^32个(密钥, 分组)
+#   saes3   带列混淆的S-AES（saes.mixcol），2^32个(密钥, 分组)
+#   narrow  8位状态的S-AES（saes.narrow），2^24个(密钥, 分组)
+# 每个密钥段还抽查几个点，与逐分组的参考实现（以及T表、比特切片实现）比较。
+# 外部测试向量：教科书S-AES（Stallings/Holden）的已发表向量用共用的S盒、轮常数和GF(2^4)乘法
+# 按教科书的定义组合后检查；三个变体本身与教科书不同，只报告差别。
+# 进度定期写入检查点文件，中断后用同一命令继续。
+# 用法: python -m saes.verify --workers 4 --checkpoint verify.json [--variants saes3] [--keys 0:0x100]
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from . import basic, bitslice, brute_force, mixcol, narrow
+from .common import S_BOX, INV_S_BOX, RCON1, RCON2, mult, sub_byte
+
+__all__ = [
+    'VARIANTS', 'TEXTBOOK_VECTORS', 'REGRESSION_VECTORS', 'reference_encrypt', 'reference_decrypt',
+    'textbook_encrypt', 'textbook_decrypt', 'check_textbook', 'check_vectors', 'textbook_comparison', 'sweep',
+]
+
+VARIANTS = ('saes2', 'saes3', 'narrow')
+
+# 教科书S-AES已发表的测试向量 (密钥, 明文, 密文)。本仓库的三个变体都与它不同：
+# 密钥扩展都没有RotNib；saes2没有列混淆；saes3的轮密钥加只用轮密钥低字节，nibble按行排列；
+# narrow只有8位状态。
+TEXTBOOK_VECTORS = [(0xA73B, 0x6F6B, 0x0738), (0x4AF5, 0xD728, 0x24EC)]
+
+# 各变体的回归向量 (密钥, 明文, 密文)：由本仓库逐分组的参考实现生成后固定下来，
+# 用于发现实现的改动，并不能证明实现正确
+REGRESSION_VECTORS = {
+    'saes2': [(0xA73B, 0x6F6B, 0xB9F7), (0x4AF5, 0x4142, 0xF2FE), (0x0000, 0x0000, 0x02E4),
+              (0xFFFF, 0xFFFF, 0x6942), (0x2D55, 0xD728, 0xB25E), (0x1234, 0xABCD, 0x128C)],
+    'saes3': [(0xA73B, 0x6F6B, 0x2479), (0x4AF5, 0x4142, 0x8DD4), (0x0000, 0x0000, 0x78D2),
+              (0xFFFF, 0xFFFF, 0x6677), (0x2D55, 0xD728, 0x8A34), (0x1234, 0xABCD, 0x7CF4)],
+    'narrow': [(0xA73B, 0x6B, 0xE1), (0x4AF5, 0x42, 0x30), (0x0000, 0x00, 0x3B),
+               (0xFFFF, 0xFF, 0x80), (0x2D55, 0x28, 0x71), (0x1234, 0xCD, 0xC4)],
+}
+
+# 每个任务处理的密钥数（narrow每个密钥只有256个分组，一次处理更多密钥）
+KEY_CHUNK = {'saes2': 16, 'saes3': 16, 'narrow': 4096}
+# 每个密钥段抽查的点数
+SPOT_CHECKS = 4
+# 每个任务最多记录的失败样例数
+MAX_FAILURES = 10
+# 检查点写入间隔（秒）
+CHECKPOINT_INTERVAL = 10.0
+
+
+# 逐分组的参考实现（未向量化的原始函数）
+def reference_encrypt(variant, block, key):
+    if variant == 'saes2':
+        return basic.s_aes_encrypt(block, key)
+    if variant == 'saes3':
+        return mixcol.nibbles_to_block(mixcol.encrypt(mixcol.block_to_nibbles(block), key))
+    return narrow.encrypt(block, key)
+
+def reference_decrypt(variant, block, key):
+    if variant == 'saes2':
+        return basic.s_aes_decrypt(block, key)
+    if variant == 'saes3':
+        return mixcol.nibbles_to_block(mixcol.decrypt(mixcol.block_to_nibbles(block), key))
+    return narrow.decrypt(block, key)
+
+# 教科书S-AES：状态按列排列 (S00, S10, S01, S11)，密钥扩展含RotNib
+def _textbook_round_keys(key):
+    w0, w1 = key >> 8, key & 0xFF
+    w2 = w0 ^ RCON1 ^ sub_byte((w1 << 4 | w1 >> 4) & 0xFF)
+    w3 = w2 ^ w1
+    w4 = w2 ^ RCON2 ^ sub_byte((w3 << 4 | w3 >> 4) & 0xFF)
+    w5 = w4 ^ w3
+    return [[(k >> shift) & 0xF for shift in (12, 8, 4, 0)] for k in (key, w2 << 8 | w3, w4 << 8 | w5)]
+
+def _textbook_shift_rows(s):
+    return [s[0], s[3], s[2], s[1]]
+
+def _textbook_mix_columns(s, a, b):
+    return [mult(a, s[0]) ^ mult(b, s[1]), mult(b, s[0]) ^ mult(a, s[1]),
+            mult(a, s[2]) ^ mult(b, s[3]), mult(b, s[2]) ^ mult(a, s[3])]
+
+def _textbook_add(s, k):
+    return [x ^ y for x, y in zip(s, k)]
+
+def textbook_encrypt(block, key):
+    """Textbook S-AES encryption built from the shared S-box, round constants and `mult`."""
+    k0, k1, k2 = _textbook_round_keys(key)
+    s = _textbook_add([(block >> shift) & 0xF for shift in (12, 8, 4, 0)], k0)
+    s = _textbook_mix_columns(_textbook_shift_rows([S_BOX[x] for x in s]), 1, 4)
+    s = _textbook_shift_rows([S_BOX[x] for x in _textbook_add(s, k1)])
+    s = _textbook_add(s, k2)
+    return s[0] << 12 | s[1] << 8 | s[2] << 4 | s[3]
+
+def textbook_decrypt(block, key):
+    """Inverse of `textbook_encrypt`."""
+    k0, k1, k2 = _textbook_round_keys(key)
+    s = _textbook_add([(block >> shift) & 0xF for shift in (12, 8, 4, 0)], k2)
+    s = [INV_S_BOX[x] for x in _textbook_shift_rows(s)]
+    s = _textbook_mix_columns(_textbook_add(s, k1), 9, 2)
+    s = [INV_S_BOX[x] for x in _textbook_shift_rows(s)]
+    s = _textbook_add(s, k0)
+    return s[0] << 12 | s[1] << 8 | s[2] << 4 | s[3]
+
+# 同一个点在各个实现中的加密结果
+def _engines(variant, block, key):
+    results = {'reference': reference_encrypt(variant, block, key)}
+    if variant == 'saes2':
+        results['vectorized'] = int(brute_force.encrypt_under_keys(block, [key], 'saes2')[0])
+    elif variant == 'saes3':
+        results['vectorized'] = int(mixcol.encrypt_under_keys(block, key))
+        results['ttable'] = mixcol.encrypt_block(block, key)
+        results['bitslice'] = int(bitslice.encrypt_many([block], key)[0])
+    else:
+        results['vectorized'] = int(narrow.encrypt_under_keys(block, key))
+    return results
+
+
+def check_textbook():
+    """Check `textbook_encrypt`/`textbook_decrypt` against `TEXTBOOK_VECTORS`."""
+    return [{'key': key, 'plaintext': plaintext, 'ciphertext': ciphertext,
+             'output': textbook_encrypt(plaintext, key), 'decrypted': textbook_decrypt(ciphertext, key),
+             'ok': textbook_encrypt(plaintext, key) == ciphertext and textbook_decrypt(ciphertext, key) == plaintext}
+            for key, plaintext, ciphertext in TEXTBOOK_VECTORS]
+
+def check_vectors(variants=VARIANTS):
+    """Check every implementation of each variant against `REGRESSION_VECTORS`."""
+    results = []
+    for variant in variants:
+        for key, plaintext, ciphertext in REGRESSION_VECTORS[variant]:
+            outputs = _engines(variant, plaintext, key)
+            decrypted = reference_decrypt(variant, ciphertext, key)
+            results.append({
+                'variant': variant, 'key': key, 'plaintext': plaintext, 'ciphertext': ciphertext,
+                'outputs': outputs, 'decrypted': decrypted,
+                'ok': all(v == ciphertext for v in outputs.values()) and decrypted == plaintext,
+            })
+    return results
+
+def textbook_comparison(variants=VARIANTS):
+    """Encrypt the first of `TEXTBOOK_VECTORS` with each variant; returns {variant: (output, matches)}."""
+    key, plaintext, ciphertext = TEXTBOOK_VECTORS[0]
+    result = {}
+    for variant in variants:
+        block = plaintext & 0xFF if variant == 'narrow' else plaintext
+        output = reference_encrypt(variant, block, key)
+        result[variant] = (output, output == ciphertext)
+    return result
+
+
+# 检查一段密钥下的全部分组（进程池任务）
+def _sweep_chunk(task):
+    variant, start, stop = task
+    keys = np.arange(start, stop)[:, None]
+    blocks = np.arange(0x100 if variant == 'narrow' else 0x10000)[None, :]
+    if variant == 'saes2':
+        ciphertexts = brute_force.encrypt_under_keys(blocks, keys, 'saes2')
+        bad = brute_force.decrypt_under_keys(ciphertexts, keys, 'saes2') != blocks
+    elif variant == 'saes3':
+        ciphertexts = mixcol.encrypt_under_keys(blocks, keys)
+        bad = mixcol.decrypt_under_keys(ciphertexts, keys) != blocks
+    else:
+        ciphertexts = narrow.encrypt_under_keys(blocks, keys)
+        bad = narrow.decrypt_under_keys(ciphertexts, keys) != blocks
+
+    failures = [(start + int(k), int(b), 'round trip') for k, b in np.argwhere(bad)[:MAX_FAILURES]]
+    # 抽查：与逐分组参考实现及其他实现比较
+    rng = np.random.default_rng([VARIANTS.index(variant), start])
+    for k, b in zip(rng.integers(0, stop - start, SPOT_CHECKS), rng.integers(0, blocks.shape[1], SPOT_CHECKS)):
+        key, block, expected = start + int(k), int(b), int(ciphertexts[k, b])
+        outputs = _engines(variant, block, key)
+        if any(v != expected for v in outputs.values()) or reference_decrypt(variant, expected, key) != block:
+            failures.append((key, block, f'spot check {outputs} vs {expected}'))
+    return variant, start, int(bad.size), failures[:MAX_FAILURES]
+
+
+def _load_checkpoint(path, key_range):
+    if path and os.path.exists(path):
+        with open(path, encoding='utf-8') as f:
+            state = json.load(f)
+        if state.get('key_range') == list(key_range):
+            return state
+    return {'key_range': list(key_range), 'done': {}, 'checked': {}, 'failures': {}}
+
+def _save_checkpoint(path, state):
+    temp_path = path + '.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f)
+    os.replace(temp_path, path)
+
+
+def sweep(variants=VARIANTS, key_range=(0, 0x10000), workers=1, checkpoint=None, progress=None):
+    """Run the round-trip/equivalence sweep over every key in `key_range`.
+
+    With `checkpoint`, finished chunks are recorded in that JSON file and
+    skipped when the same sweep is started again. `progress(done, total)` is
+    called after each chunk. Returns {'checked': {variant: count},
+    'failures': {variant: [(key, block, reason)]}, 'seconds': elapsed}.
+    """
+    state = _load_checkpoint(checkpoint, key_range)
+    tasks = []
+    for variant in variants:
+        done = set(state['done'].get(variant, []))
+        step = KEY_CHUNK[variant]
+        tasks += [(variant, start, min(start + step, key_range[1]))
+                  for start in range(key_range[0], key_range[1], step) if start not in done]
+    total = sum(len(state['done'].get(v, [])) for v in variants) + len(tasks)
+    finished = total - len(tasks)
+    started = last_saved = time.perf_counter()
+
+    def record(result):
+        nonlocal finished, last_saved
+        variant, start, checked, failures = result
+        state['done'].setdefault(variant, []).append(start)
+        state['checked'][variant] = state['checked'].get(variant, 0) + checked
+        state['failures'].setdefault(variant, []).extend(failures)
+        finished += 1
+        if progress:
+            progress(finished, total)
+        if checkpoint and time.perf_counter() - last_saved >= CHECKPOINT_INTERVAL:
+            _save_checkpoint(checkpoint, state)
+            last_saved = time.perf_counter()
+
+    workers = workers or os.cpu_count() or 1
+    try:
+        if workers == 1:
+            for task in tasks:
+                record(_sweep_chunk(task))
+        else:
+            with ProcessPoolExecutor(workers) as pool:
+                for future in as_completed([pool.submit(_sweep_chunk, task) for task in tasks]):
+                    record(future.result())
+    finally:
+        if checkpoint:
+            _save_checkpoint(checkpoint, state)
+    return {
+        'checked': {v: state['checked'].get(v, 0) for v in variants},
+        'failures': {v: state['failures'].get(v, []) for v in variants},
+        'seconds': time.perf_counter() - started,
+    }
+
+
+def _parse_range(text):
+    start, stop = (int(x, 0) for x in text.split(':'))
+    return start, stop
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Exhaustive round-trip and cross-implementation check")
+    parser.add_argument('--variants', nargs='+', choices=VARIANTS, default=list(VARIANTS))
+    parser.add_argument('--keys', type=_parse_range, default=(0, 0x10000), help="key range START:STOP")
+    parser.add_argument('--workers', type=int, default=None, help="number of processes (default: CPU count)")
+    parser.add_argument('--checkpoint', help="JSON file used to save and resume progress")
+    args = parser.parse_args(argv)
+
+    ok = True
+    for result in check_textbook():
+        ok &= result['ok']
+        print(f"textbook key {result['key']:#06x} {result['plaintext']:#06x} -> {result['ciphertext']:#06x}: "
+              f"{'ok' if result['ok'] else 'MISMATCH ' + hex(result['output'])}")
+    for result in check_vectors(args.variants):
+        ok &= result['ok']
+        print(f"{result['variant']:<7} key {result['key']:#06x} {result['plaintext']:#06x} -> "
+              f"{result['ciphertext']:#06x}: {'ok' if result['ok'] else 'MISMATCH ' + str(result['outputs'])}")
+    for variant, (output, matches) in textbook_comparison(args.variants).items():
+        print(f"{variant:<7} on the textbook vector: got {output:#06x}, "
+              f"{'matches' if matches else 'differs (expected, variant is not textbook S-AES)'}")
+
+    def progress(done, total):
+        print(f"\rchunks {done}/{total}", end='', file=sys.stderr, flush=True)
+
+    report = sweep(args.variants, args.keys, args.workers, args.checkpoint, progress)
+    print(file=sys.stderr)
+    for variant in args.variants:
+        failures = report['failures'][variant]
+        ok &= not failures
+        print(f"{variant:<7} {report['checked'][variant]} (key, block) pairs checked, {len(failures)} failure(s)")
+        for key, block, reason in failures[:MAX_FAILURES]:
+            print(f"    key {key:#06x} block {block:#06x}: {reason}")
+    print(f"{report['seconds']:.1f} s")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())